@@ -0,0 +1,65 @@
+"""
+assets module
+"""
+
+import json
+import os
+
+from manifest import cached_hash
+from utils import copy_file, remove_output
+
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+FINGERPRINT_LENGTH = 8
+
+
+def fingerprinted_name(rel_path: str, digest: str) -> str:
+    """index.css -> index.3f9a1c2b.css"""
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def fingerprint_static(static_dir: str, dest_dir_path: str, link: bool = False) -> dict[str, str]:
+    """Write a content-addressed copy of every static file into dest_dir_path
+
+    Files keep their plain name too, so references the page generator
+    does not rewrite (CSS url(), external links) still work. The map of
+    plain to fingerprinted paths is written to asset-manifest.json along
+    with each file's size, mtime and hash, so unchanged files are not
+    hashed again, and fingerprinted copies of old versions are removed.
+    Copies are hardlinked to the source when link is set and allowed.
+    """
+    manifest_path = os.path.join(dest_dir_path, ASSET_MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r") as manifest_file:
+            previous = json.load(manifest_file).get("files", {})
+    except (OSError, ValueError):
+        previous = {}
+    files: dict[str, dict] = {}
+    for root, dirs, names in os.walk(static_dir):
+        dirs.sort()
+        for name in sorted(names):
+            src_path = os.path.join(root, name)
+            rel_path = os.path.relpath(src_path, static_dir).replace(os.sep, "/")
+            stat = os.stat(src_path)
+            digest = cached_hash(src_path, stat, previous.get(rel_path))
+            target = fingerprinted_name(rel_path, digest)
+            dest_path = os.path.join(dest_dir_path, target)
+            if not os.path.exists(dest_path):
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                copy_file(src_path, dest_path, link)
+            files[rel_path] = {
+                "hash": digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "path": target,
+            }
+    live = {entry["path"] for entry in files.values()}
+    for entry in previous.values():
+        if entry["path"] not in live:
+            remove_output(dest_dir_path, entry["path"])
+    assets = {rel_path: entry["path"] for rel_path, entry in files.items()}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as manifest_file:
+        json.dump({"assets": assets, "files": files}, manifest_file, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return assets
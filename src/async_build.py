@@ -0,0 +1,132 @@
+"""
+async_build module
+
+Build driver for slow storage: page sources are read and finished pages
+written on a thread pool while the event loop renders, so disk waits of
+many pages overlap with each other and with rendering.
+"""
+
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from block_cache import BlockCache
+from links import LinkIndex
+from parse_cache import ParseCache
+from search import PageTerms, SearchIndex
+from template import TemplateResolver
+from utils import render_page, write_atomic
+
+# Pages read ahead or waiting to be written, per I/O thread
+PAGES_IN_FLIGHT_PER_WORKER = 2
+
+
+def generate_pages_async(
+    pages,
+    templates: TemplateResolver,
+    io_workers: int = 8,
+    cache: BlockCache | None = None,
+    links: LinkIndex | None = None,
+    search: SearchIndex | None = None,
+    parse_cache: ParseCache | None = None,
+):
+    """Generate (source, destination) pairs, overlapping their file I/O
+
+    Each page renders with the template templates resolves for it.
+    Sources are read ahead and pages written on io_workers threads, with
+    at most PAGES_IN_FLIGHT_PER_WORKER pages per thread held in memory.
+    Rendering runs on one thread in input order, so the output, block
+    cache and link index match a serial build. After a failure no new
+    pages are started, and the first failing page in input order is
+    reported once the pages in flight have settled.
+    """
+    asyncio.run(
+        _generate_pages(
+            pages,
+            templates,
+            max(io_workers, 1),
+            cache,
+            links,
+            search,
+            parse_cache,
+        )
+    )
+
+
+async def _generate_pages(pages, templates, io_workers, cache, links, search, parse_cache):
+    loop = asyncio.get_running_loop()
+    window = io_workers * PAGES_IN_FLIGHT_PER_WORKER
+    pages = enumerate(pages)
+    reads: deque = deque()
+    writes: dict[asyncio.Future, tuple[int, str]] = {}
+    failures: list[tuple[int, str, Exception]] = []
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=io_workers) as pool:
+        try:
+            while True:
+                for future in [future for future in writes if future.done()]:
+                    _reap_write(future, writes, failures)
+                while not exhausted and not failures and len(reads) + len(writes) < window:
+                    item = next(pages, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, (src_path, dest_path) = item
+                    reads.append(
+                        (index, src_path, dest_path, loop.run_in_executor(pool, _read_text, src_path))
+                    )
+                if reads and not failures:
+                    index, src_path, dest_path, read = reads.popleft()
+                    try:
+                        md_content = await read
+                        template_path, template = templates.resolve(src_path)
+                        print(
+                            f"Generating page from '{src_path}' to '{dest_path}'"
+                            f" using template '{template_path}'"
+                        )
+                        refs = [] if links is not None else None
+                        terms = PageTerms() if search is not None else None
+                        page = render_page(
+                            md_content, template, cache, refs, terms, parse_cache
+                        )
+                    except Exception as err:
+                        failures.append((index, src_path, err))
+                        continue
+                    if links is not None:
+                        links.add(dest_path, refs)
+                    if search is not None:
+                        search.add(dest_path, terms)
+                    write = loop.run_in_executor(pool, _write_page, dest_path, page)
+                    writes[write] = (index, src_path)
+                elif writes:
+                    await asyncio.wait(writes, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    break
+        finally:
+            for _, _, _, read in reads:
+                read.cancel()
+            if writes:
+                await asyncio.wait(writes)
+                for future in list(writes):
+                    _reap_write(future, writes, failures)
+    if failures:
+        _, src_path, err = min(failures, key=lambda failure: failure[0])
+        raise RuntimeError(f"failed to generate page '{src_path}': {err!r}") from err
+
+
+def _reap_write(future: asyncio.Future, writes: dict, failures: list):
+    index, src_path = writes.pop(future)
+    err = future.exception()
+    if err is not None:
+        failures.append((index, src_path, err))
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r") as content_file:
+        return content_file.read()
+
+
+def _write_page(dest_path: str, page: str):
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    write_atomic(dest_path, lambda dest_file: dest_file.write(page))
@@ -0,0 +1,254 @@
+"""
+benchmark module
+
+Generates a synthetic content tree and times each build stage on it.
+Run with `./bench.sh` or `python3 src/benchmark.py --help`.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import utils
+from template import Template
+from utils import (
+    block_to_block_type,
+    extract_title,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    text_to_textnodes,
+)
+
+WORDS = (
+    "elf ring shire hobbit wizard mountain river forest song road king "
+    "shadow light tower sword star journey fellowship council gate"
+).split()
+
+
+def random_words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def random_inline(rng: random.Random, count: int) -> str:
+    """A sentence mixing plain words with every inline element"""
+    parts = []
+    for _ in range(count):
+        roll = rng.random()
+        word = rng.choice(WORDS)
+        if roll < 0.05:
+            parts.append(f"**{word}**")
+        elif roll < 0.1:
+            parts.append(f"_{word}_")
+        elif roll < 0.13:
+            parts.append(f"`{word}`")
+        elif roll < 0.16:
+            parts.append(f"[{word}](/blog/{word})")
+        elif roll < 0.17:
+            parts.append(f"![{word}](/images/{word}.png)")
+        else:
+            parts.append(word)
+    return " ".join(parts)
+
+
+def random_page(rng: random.Random, shape: str, blocks: int) -> str:
+    """Build one markdown page of the given shape"""
+    lines = [f"# {random_words(rng, 4).title()}"]
+    for index in range(blocks):
+        if shape == "links":
+            lines.append(
+                " ".join(
+                    f"[{rng.choice(WORDS)}](/blog/{rng.choice(WORDS)})" for _ in range(40)
+                )
+            )
+        elif shape == "lists":
+            items = rng.randint(20, 60)
+            if index % 2:
+                lines.append("\n".join(f"{i}. {random_inline(rng, 8)}" for i in range(1, items)))
+            else:
+                lines.append("\n".join(f"- {random_inline(rng, 8)}" for _ in range(items)))
+        else:
+            kind = index % 6
+            if kind == 0:
+                lines.append(f"## {random_words(rng, 3)}")
+            elif kind == 3:
+                lines.append("> " + random_inline(rng, 20))
+            elif kind == 5:
+                lines.append("```\n" + random_words(rng, 30) + "\n```")
+            else:
+                lines.append(random_inline(rng, rng.randint(30, 120)))
+    return "\n\n".join(lines) + "\n"
+
+
+def generate_corpus(
+    root: str,
+    posts: int = 200,
+    huge: int = 2,
+    links: int = 20,
+    lists: int = 20,
+    seed: int = 0,
+) -> list[str]:
+    """Write a synthetic content tree under root and return the page paths
+
+    posts are many small pages, huge a few very long pages, links
+    link-heavy paragraphs and lists long ordered/unordered lists.
+    """
+    rng = random.Random(seed)
+    sizes = {"posts": (posts, 12), "huge": (huge, 3000), "links": (links, 40), "lists": (lists, 30)}
+    paths = []
+    for shape, (count, blocks) in sizes.items():
+        for index in range(count):
+            page_dir = os.path.join(root, shape, f"{shape}-{index}")
+            os.makedirs(page_dir, exist_ok=True)
+            path = os.path.join(page_dir, "index.md")
+            with open(path, "w") as page_file:
+                page_file.write(random_page(rng, shape, blocks))
+            paths.append(path)
+    return paths
+
+
+def time_stage(function, repeat: int) -> dict:
+    """Run function repeat times and summarize its wall times"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - start)
+    return {"best": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def run_benchmark(paths: list[str], template_text: str, out_dir: str, repeat: int = 3) -> dict:
+    """Time every build stage separately over the pages in paths"""
+    documents: list[str] = []
+
+    def read_files():
+        documents.clear()
+        for path in paths:
+            with open(path, "r") as page_file:
+                documents.append(page_file.read())
+
+    read_stats = time_stage(read_files, repeat)
+    all_blocks = [block for document in documents for block in markdown_to_blocks(document)]
+
+    # Record the exact inline inputs the block builders produce
+    inline_texts: list[str] = []
+
+    def recording_text_to_textnodes(text):
+        inline_texts.append(text)
+        return text_to_textnodes(text)
+
+    utils.text_to_textnodes = recording_text_to_textnodes
+    try:
+        trees = [markdown_to_html_node(document) for document in documents]
+    finally:
+        utils.text_to_textnodes = text_to_textnodes
+    titles = [extract_title(document) for document in documents]
+    htmls = [tree.to_html() for tree in trees]
+    pages: list[str] = []
+    template = Template(template_text, "/bench/")
+
+    def serialize():
+        for tree in trees:
+            tree.to_html()
+
+    def fill_template():
+        pages.clear()
+        for title, html in zip(titles, htmls):
+            pages.append(template.render(title, html))
+
+    def write_files():
+        for index, page in enumerate(pages):
+            with open(os.path.join(out_dir, f"{index}.html"), "w") as page_file:
+                page_file.write(page)
+
+    stages = {
+        "read": read_stats,
+        "markdown_to_blocks": time_stage(
+            lambda: [markdown_to_blocks(document) for document in documents], repeat
+        ),
+        "block_to_block_type": time_stage(
+            lambda: [block_to_block_type(block) for block in all_blocks], repeat
+        ),
+        "text_to_textnodes": time_stage(
+            lambda: [text_to_textnodes(text) for text in inline_texts], repeat
+        ),
+        "markdown_to_html_node": time_stage(
+            lambda: [markdown_to_html_node(document) for document in documents], repeat
+        ),
+        "to_html": time_stage(serialize, repeat),
+        "template": time_stage(fill_template, repeat),
+        "write": time_stage(write_files, repeat),
+    }
+    return {
+        "pages": len(documents),
+        "bytes": sum(len(document) for document in documents),
+        "blocks": len(all_blocks),
+        "inline_texts": len(inline_texts),
+        "stages": stages,
+    }
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """Format best-time ratios of results against a baseline run"""
+    lines = []
+    for name, stats in results["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if old is None or not old["best"]:
+            continue
+        ratio = stats["best"] / old["best"]
+        lines.append(f"{name:24} {old['best']:.4f}s -> {stats['best']:.4f}s ({ratio:.2f}x)")
+    return lines
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the build stages")
+    parser.add_argument("--posts", type=int, default=200, help="number of small posts")
+    parser.add_argument("--huge", type=int, default=2, help="number of very long pages")
+    parser.add_argument("--links", type=int, default=20, help="number of link-heavy pages")
+    parser.add_argument("--lists", type=int, default=20, help="number of list-heavy pages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage")
+    parser.add_argument("--template", default="template.html")
+    parser.add_argument("--output", default="bench_output.json", help="JSON results file")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.template, "r") as template_file:
+        template_text = template_file.read()
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        out_dir = os.path.join(tmp, "out")
+        os.makedirs(out_dir)
+        paths = generate_corpus(
+            content_dir, args.posts, args.huge, args.links, args.lists, args.seed
+        )
+        results = run_benchmark(paths, template_text, out_dir, args.repeat)
+    results["corpus"] = {
+        "posts": args.posts,
+        "huge": args.huge,
+        "links": args.links,
+        "lists": args.lists,
+        "seed": args.seed,
+    }
+    results["python"] = sys.version.split()[0]
+    results["platform"] = platform.platform()
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=1)
+    for name, stats in results["stages"].items():
+        print(f"{name:24} best {stats['best']:.4f}s  median {stats['median']:.4f}s")
+    if args.compare:
+        with open(args.compare, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        print("\n".join(compare(results, baseline)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+block_cache module
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+# Bump whenever block rendering changes so stale HTML is never served
+CACHE_VERSION = 2
+
+
+def block_key(block: str) -> str:
+    """Cache key for a markdown block"""
+    return hashlib.blake2b(block.encode(), digest_size=16).hexdigest()
+
+
+class BlockCache:
+    """
+    BlockCache Class
+
+    Rendered HTML fragments keyed by a hash of the block text, evicted
+    least-recently-used once the stored HTML exceeds max_bytes, and
+    persisted as JSON between builds. A worker process's copy sets
+    track_added to also keep the blocks it renders until they are
+    drained and sent back; elsewhere nothing is held beyond max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        track_added: bool = False,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.size = 0
+        self.track_added = track_added
+        self.added: dict[str, str] = {}
+
+    @classmethod
+    def load(
+        cls, path: str, max_bytes: int = 64 * 1024 * 1024, track_added: bool = False
+    ) -> "BlockCache":
+        """Load a cache file, or start empty if it is missing or stale"""
+        cache = cls(path, max_bytes, track_added)
+        try:
+            with open(path, "r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        for key, html in data.get("entries", []):
+            cache.store(key, html)
+        return cache
+
+    def save(self):
+        """Write the cache atomically, least recently used first"""
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as cache_file:
+            json.dump(
+                {"version": CACHE_VERSION, "entries": list(self.entries.items())},
+                cache_file,
+            )
+        os.replace(tmp_path, self.path)
+
+    def get(self, block: str) -> str | None:
+        """Return the cached HTML for a block, or None"""
+        key = block_key(block)
+        html = self.entries.get(key)
+        if html is None:
+            return None
+        self.entries.move_to_end(key)
+        return html
+
+    def put(self, block: str, html: str):
+        """Cache the HTML rendered for a block"""
+        key = block_key(block)
+        self.store(key, html)
+        if self.track_added:
+            self.added[key] = html
+
+    def store(self, key: str, html: str):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self.entries[key] = html
+        self.size += len(html)
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def drain_added(self) -> dict[str, str]:
+        """Return and forget the entries put since the last drain"""
+        added, self.added = self.added, {}
+        return added
+
+    def merge(self, entries: dict[str, str]):
+        """Add entries rendered elsewhere, e.g. by a worker process"""
+        for key, html in entries.items():
+            self.store(key, html)
@@ -0,0 +1,53 @@
+"""
+block_reader module
+"""
+
+
+class MarkdownBlockReader:
+    """
+    MarkdownBlockReader Class
+
+    Yields the same blocks as markdown_to_blocks while reading a text file
+    object in chunks, so only the current block is held in memory. The
+    first "# " line seen is kept in `title`, as extract_title would find it.
+    """
+
+    def __init__(self, fp, chunk_size: int = 64 * 1024):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.title: str | None = None
+
+    def __iter__(self):
+        parts: list[str] = []
+        while True:
+            chunk = self.fp.read(self.chunk_size)
+            if not chunk:
+                break
+            position = 0
+            if parts and parts[-1].endswith("\n") and chunk.startswith("\n"):
+                # a blank line split across two chunks
+                parts[-1] = parts[-1][:-1]
+                yield from self._section("".join(parts))
+                parts = []
+                position = 1
+            while True:
+                index = chunk.find("\n\n", position)
+                if index == -1:
+                    break
+                parts.append(chunk[position:index])
+                yield from self._section("".join(parts))
+                parts = []
+                position = index + 2
+            if position < len(chunk):
+                parts.append(chunk[position:])
+        yield from self._section("".join(parts))
+
+    def _section(self, section: str):
+        if self.title is None and (section.startswith("# ") or "\n# " in section):
+            for line in section.split("\n"):
+                if line.startswith("# "):
+                    self.title = line[2:].strip()
+                    break
+        if len(section) == 0:
+            return
+        yield section.strip()
@@ -0,0 +1,457 @@
+"""
+build module
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from async_build import generate_pages_async
+from block_cache import CACHE_VERSION, BlockCache
+from dependencies import DependencyGraph, page_inputs
+from frontmatter import read_front_matter_file
+from links import LinkIndex
+from parse_cache import ParseCache
+from search import PageTerms, SearchIndex
+from manifest import BuildManifest, hash_bytes, hash_file
+from profiling import BuildStats, PageStats
+from template import Template, TemplateResolver
+from utils import generate_page, iter_content_pages, remove_output
+
+# Estimated peak memory of a page in flight: the reader's chunk plus a
+# multiple of the source size for its rendered blocks and cache entries
+PAGE_BASE_BYTES = 64 * 1024
+PAGE_MEMORY_FACTOR = 4
+
+
+def collect_pages(
+    dir_path_content: str,
+    dest_dir_path: str,
+    drafts: bool = False,
+    templates: dict[str, str] | None = None,
+) -> list[tuple[str, str]]:
+    """Collect (source, destination) pairs for every page under a content directory
+
+    Only each page's front matter is read: drafts are left out unless
+    drafts is set, before any markdown is parsed, and the template a
+    page names is recorded in templates, keyed by source path.
+    """
+    pages: list[tuple[str, str]] = []
+    for src_path, dest_path in iter_content_pages(dir_path_content, dest_dir_path):
+        front_matter = read_front_matter_file(src_path)
+        if front_matter.draft and not drafts:
+            continue
+        if templates is not None and front_matter.template is not None:
+            templates[src_path] = front_matter.template
+        pages.append((src_path, dest_path))
+    return pages
+
+
+class PageJob:
+    """
+    PageJob Class
+
+    Settings shared by every page of one generate_pages call, sent once
+    with each task to worker processes. Each task carries its page's
+    template path alongside; workers compile each template once.
+    """
+
+    __slots__ = (
+        "basepath",
+        "profile",
+        "collect_links",
+        "cache_spec",
+        "collect_terms",
+        "parse_cache",
+    )
+
+    def __init__(
+        self,
+        basepath: str,
+        profile: bool = False,
+        collect_links: bool = False,
+        cache_spec: tuple[str | None, int] | None = None,
+        collect_terms: bool = False,
+        parse_cache: ParseCache | None = None,
+    ):
+        self.basepath = basepath
+        self.profile = profile
+        self.collect_links = collect_links
+        self.cache_spec = cache_spec
+        self.collect_terms = collect_terms
+        self.parse_cache = parse_cache
+
+
+class PageResult:
+    """
+    PageResult Class
+
+    What generating one page hands back to the build: its stage timings,
+    outgoing links, search terms and the block cache entries it rendered.
+    """
+
+    __slots__ = ("src_path", "dest_path", "stats", "links", "cache_entries", "search")
+
+    def __init__(self, src_path: str, dest_path: str):
+        self.src_path = src_path
+        self.dest_path = dest_path
+        self.stats: PageStats | None = None
+        self.links: list[str] | None = None
+        self.cache_entries: dict[str, str] | None = None
+        self.search: PageTerms | None = None
+
+
+def generate_pages(
+    pages,
+    template_path: str,
+    basepath: str = "/",
+    jobs: int = 1,
+    stats: BuildStats | None = None,
+    cache: BlockCache | None = None,
+    links: LinkIndex | None = None,
+    assets: dict[str, str] | None = None,
+    memory_budget: int | None = None,
+    io_workers: int = 0,
+    search: SearchIndex | None = None,
+    parse_cache: ParseCache | None = None,
+    content_dir: str | None = None,
+    page_templates: dict[str, str] | None = None,
+):
+    """Generate (source, destination) pairs, on a process pool when jobs > 1
+
+    Pages render independently, so the output is identical to a serial
+    build. The first failing page, in input order, is reported. Pass
+    stats to collect per-page stage timings, cache to reuse rendered
+    blocks, links to index every page's outgoing references, assets to
+    point references at fingerprinted static files, search to index
+    every page's terms and parse_cache to load unchanged pages' node
+    trees instead of parsing them. Worker processes load the cache from
+    its file once each and send back the blocks they render, which are
+    merged into cache.
+
+    With content_dir, each page uses the nearest template.html above it
+    there instead of template_path (see TemplateResolver), and
+    page_templates holds the templates pages name in their front matter
+    (see collect_pages). Every template is compiled once per process.
+
+    pages may be any iterable and is consumed lazily. With a
+    memory_budget in bytes, a parallel build only submits another page
+    while the estimated memory of the pages in flight stays within it
+    (one page is always allowed) and at most two pages per worker are
+    queued; results are collected in order as the window slides.
+
+    With io_workers and a single job, pages are rendered in order on
+    this process while their files are read and written on io_workers
+    threads (see async_build). Stage timings are not collected then.
+    """
+    pages = iter(pages)
+    templates = TemplateResolver(template_path, content_dir, basepath, assets, page_templates)
+    job = PageJob(
+        basepath,
+        profile=stats is not None,
+        collect_links=links is not None,
+        cache_spec=(cache.path, cache.max_bytes) if cache is not None else None,
+        collect_terms=search is not None,
+        parse_cache=parse_cache,
+    )
+    if io_workers > 0 and jobs == 1 and stats is None:
+        generate_pages_async(
+            pages, templates, io_workers, cache, links, search, parse_cache
+        )
+        return
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    head = list(islice(pages, 2))
+    pages = chain(head, pages)
+    dest_dirs: set[str] = set()
+    if jobs == 1 or len(head) < 2:
+        for src_path, dest_path in pages:
+            _make_dest_dir(dest_path, dest_dirs)
+            page_template = templates.resolve(src_path)
+            result = _generate_page_task(job, src_path, dest_path, page_template, cache)
+            _collect_result(result, stats, None, links, search)
+        return
+    in_flight: deque = deque()
+    in_flight_bytes = 0
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(template_path, basepath, assets),
+    ) as executor:
+        try:
+            for src_path, dest_path in pages:
+                weight = page_memory_estimate(src_path) if memory_budget is not None else 0
+                while in_flight and memory_budget is not None and (
+                    len(in_flight) >= 2 * jobs or in_flight_bytes + weight > memory_budget
+                ):
+                    future, done_weight = in_flight.popleft()
+                    in_flight_bytes -= done_weight
+                    _collect_result(future.result(), stats, cache, links, search)
+                _make_dest_dir(dest_path, dest_dirs)
+                future = executor.submit(
+                    _generate_page_worker, job, src_path, dest_path, templates.path_for(src_path)
+                )
+                in_flight.append((future, weight))
+                in_flight_bytes += weight
+            while in_flight:
+                future, _ = in_flight.popleft()
+                _collect_result(future.result(), stats, cache, links, search)
+        except BaseException:
+            for future, _ in in_flight:
+                future.cancel()
+            raise
+
+
+def page_memory_estimate(src_path: str) -> int:
+    """Bytes a page is assumed to hold while it is being generated"""
+    return PAGE_BASE_BYTES + os.path.getsize(src_path) * PAGE_MEMORY_FACTOR
+
+
+def _make_dest_dir(dest_path: str, dest_dirs: set[str]):
+    dest_dir = os.path.dirname(dest_path) or "."
+    if dest_dir not in dest_dirs:
+        os.makedirs(dest_dir, exist_ok=True)
+        dest_dirs.add(dest_dir)
+
+
+def _collect_result(
+    result: PageResult,
+    stats: BuildStats | None,
+    cache: BlockCache | None,
+    links: LinkIndex | None,
+    search: SearchIndex | None = None,
+):
+    if stats is not None:
+        stats.add_page(result.stats)
+    if cache is not None and result.cache_entries:
+        cache.merge(result.cache_entries)
+    if links is not None:
+        links.add(result.dest_path, result.links)
+    if search is not None:
+        search.add(result.dest_path, result.search)
+
+
+_worker_cache: BlockCache | None = None
+_worker_templates: TemplateResolver | None = None
+
+
+def _init_worker(template_path: str, basepath: str, assets: dict[str, str] | None):
+    """Set up a worker process once, so tasks only carry their template's path"""
+    global _worker_templates
+    _worker_templates = TemplateResolver(template_path, None, basepath, assets)
+
+
+def _generate_page_worker(
+    job: PageJob, src_path: str, dest_path: str, template_path: str
+) -> PageResult:
+    global _worker_cache
+    cache = None
+    if job.cache_spec is not None:
+        if _worker_cache is None or (_worker_cache.path, _worker_cache.max_bytes) != job.cache_spec:
+            path, max_bytes = job.cache_spec
+            _worker_cache = (
+                BlockCache.load(path, max_bytes, track_added=True)
+                if path
+                else BlockCache(None, max_bytes, track_added=True)
+            )
+        cache = _worker_cache
+    page_template = (template_path, _worker_templates.get(template_path))
+    result = _generate_page_task(job, src_path, dest_path, page_template, cache)
+    if cache is not None:
+        result.cache_entries = cache.drain_added()
+    return result
+
+
+def _generate_page_task(
+    job: PageJob,
+    src_path: str,
+    dest_path: str,
+    page_template: tuple[str, Template],
+    cache: BlockCache | None = None,
+) -> PageResult:
+    template_path, template = page_template
+    result = PageResult(src_path, dest_path)
+    if job.profile:
+        result.stats = PageStats(src_path)
+    if job.collect_links:
+        result.links = []
+    if job.collect_terms:
+        result.search = PageTerms()
+    try:
+        generate_page(
+            src_path,
+            template_path,
+            dest_path,
+            job.basepath,
+            template,
+            result.stats,
+            cache,
+            result.links,
+            result.search,
+            job.parse_cache,
+        )
+    except Exception as err:
+        raise RuntimeError(f"failed to generate page '{src_path}': {err!r}") from err
+    return result
+
+
+def generate_pages_incremental(
+    dir_path_content: str,
+    template_path: str,
+    dest_dir_path: str,
+    basepath: str = "/",
+    jobs: int = 1,
+    stats: BuildStats | None = None,
+    cache: BlockCache | None = None,
+    links: LinkIndex | None = None,
+    assets: dict[str, str] | None = None,
+    memory_budget: int | None = None,
+    io_workers: int = 0,
+    search: SearchIndex | None = None,
+    parse_cache: ParseCache | None = None,
+    drafts: bool = False,
+) -> list[str]:
+    """Generate only the pages whose inputs changed since the last build
+
+    The manifest records the build-wide inputs once (the basepath, the
+    renderer version and the set of fingerprinted static files); when
+    any of them changes every page is rebuilt. Each page's entry records
+    the inputs only it depends on (see dependencies): its source, its
+    template (the one named in its front matter, else the nearest
+    template.html above it in the content directory, else
+    template_path), the fingerprinted assets it references and the pages
+    it links to. Only pages with a changed input are rebuilt, so editing
+    one image or one section's template rebuilds just the pages using
+    it. Outputs whose sources are gone are removed. Returns the rebuilt
+    sources.
+
+    Each page's outgoing links are kept in the manifest, so links is
+    filled in for unchanged pages too. So are its search terms once a
+    build has been given search; pages without them are rebuilt. Drafts
+    are left out unless drafts is set, so marking a page as a draft
+    removes its output. A page's draft flag and template are kept next
+    to its hash, so only new or changed sources have their front matter
+    read.
+    """
+    manifest = BuildManifest.load(dest_dir_path)
+    build_inputs = {
+        "basepath": hash_bytes(basepath.encode()),
+        "renderer": str(CACHE_VERSION),
+        # which static files are fingerprinted: turning fingerprinting on
+        # or off renames references to files a page never recorded
+        "assets": hash_bytes("\n".join(sorted(assets or {})).encode()),
+    }
+    overrides: dict[str, str] = {}
+    pages: dict[str, dict] = {}
+    skipped: dict[str, dict] = {}
+    paths: dict[str, tuple[str, str]] = {}
+    for src_path, dest_path in iter_content_pages(dir_path_content, dest_dir_path):
+        key = os.path.relpath(src_path, dir_path_content)
+        entry = manifest.source_entry(key, src_path)
+        old = manifest.pages.get(key)
+        if old is not None and old["hash"] == entry["hash"] and "draft" in old:
+            entry["draft"] = old["draft"]
+            if "template" in old:
+                entry["template"] = old["template"]
+        else:
+            front_matter = read_front_matter_file(src_path)
+            entry["draft"] = front_matter.draft
+            if front_matter.template is not None:
+                entry["template"] = front_matter.template
+        if entry["draft"] and not drafts:
+            skipped[key] = entry
+            continue
+        if "template" in entry:
+            overrides[src_path] = entry["template"]
+        entry["dest"] = os.path.relpath(dest_path, dest_dir_path)
+        pages[key] = entry
+        paths[key] = (src_path, dest_path)
+    templates = TemplateResolver(template_path, dir_path_content, overrides=overrides)
+    template_inputs: dict[str, str] = {}
+    page_templates: dict[str, str] = {}
+    for key, (src_path, _) in paths.items():
+        page_template = templates.path_for(src_path)
+        template_id = f"template:{page_template}"
+        if template_id not in template_inputs:
+            template_inputs[template_id] = hash_file(page_template)
+        page_templates[key] = template_id
+    rebuild_all = manifest.inputs != build_inputs
+    page_keys = {entry["dest"].replace(os.sep, "/") for entry in pages.values()}
+    current = dict(template_inputs)
+    current.update((f"source:{key}", entry["hash"]) for key, entry in pages.items())
+    current.update((f"page:{page_key}", "1") for page_key in page_keys)
+    if assets:
+        current.update((f"asset:{path}", name) for path, name in assets.items())
+    graph = DependencyGraph()
+    for key, old in manifest.pages.items():
+        if "deps" in old:
+            graph.add(key, old["deps"])
+    invalidated = graph.invalidated(current)
+    stale: list[tuple[str, str]] = []
+    for key, entry in pages.items():
+        old = manifest.pages.get(key)
+        if (
+            rebuild_all
+            or old is None
+            or key in invalidated
+            or "deps" not in old
+            or page_templates[key] not in old["deps"]
+            or old.get("dest") != entry["dest"]
+            or "links" not in old
+            or (search is not None and "search" not in old)
+            or not os.path.exists(paths[key][1])
+        ):
+            stale.append(paths[key])
+    stale_links = LinkIndex(dest_dir_path)
+    stale_search = SearchIndex(dest_dir_path) if search is not None else None
+    generate_pages(
+        stale,
+        template_path,
+        basepath,
+        jobs=jobs,
+        stats=stats,
+        cache=cache,
+        links=stale_links,
+        assets=assets,
+        memory_budget=memory_budget,
+        io_workers=io_workers,
+        search=stale_search,
+        parse_cache=parse_cache,
+        content_dir=dir_path_content,
+        page_templates=overrides,
+    )
+    for key, entry in pages.items():
+        page_key = entry["dest"].replace(os.sep, "/")
+        if page_key in stale_links.pages:
+            entry["links"] = stale_links.pages[page_key]
+            entry["deps"] = page_inputs(
+                page_key,
+                entry["links"],
+                {
+                    page_templates[key]: template_inputs[page_templates[key]],
+                    f"source:{key}": entry["hash"],
+                },
+                assets,
+                page_keys,
+            )
+        else:
+            entry["links"] = manifest.pages[key]["links"]
+            entry["deps"] = manifest.pages[key]["deps"]
+        if links is not None:
+            links.pages[page_key] = entry["links"]
+        if stale_search is not None and page_key in stale_search.pages:
+            entry["search"] = stale_search.pages[page_key].to_dict()
+        elif page_key not in stale_links.pages and "search" in manifest.pages[key]:
+            entry["search"] = manifest.pages[key]["search"]
+        if search is not None:
+            search.pages[page_key] = PageTerms.from_dict(entry["search"])
+    live_outputs = {entry["dest"] for entry in pages.values()}
+    for key, old in manifest.pages.items():
+        if key not in pages and "dest" in old and old["dest"] not in live_outputs:
+            remove_output(dest_dir_path, old["dest"])
+    manifest.inputs = build_inputs
+    manifest.pages = pages | skipped
+    manifest.save()
+    return [src_path for src_path, _ in stale]
+
@@ -0,0 +1,108 @@
+"""
+compress module
+"""
+
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import cached_hash
+from utils import remove_output
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MANIFEST_NAME = ".compress-manifest.json"
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".mjs", ".svg", ".json", ".xml", ".txt")
+MIN_COMPRESS_SIZE = 1024
+
+
+def compressors() -> dict[str, object]:
+    """Sibling suffix -> function compressing bytes; .br only with brotli installed"""
+    formats = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        formats[".br"] = lambda data: brotli.compress(data, quality=11)
+    return formats
+
+
+def compress_file(path: str, formats: dict[str, object]):
+    """Write a compressed sibling of path for every format"""
+    with open(path, "rb") as src:
+        data = src.read()
+    for suffix, compress in formats.items():
+        tmp_path = path + suffix + ".tmp"
+        with open(tmp_path, "wb") as dst:
+            dst.write(compress(data))
+        os.replace(tmp_path, path + suffix)
+
+
+def precompress_dir(
+    dest_dir_path: str, jobs: int = 1, min_size: int = MIN_COMPRESS_SIZE
+) -> list[str]:
+    """Write .gz (and .br) siblings for the text files of an output dir
+
+    Files smaller than min_size are left alone. A file is only compressed
+    again when its content hash differs from the last run's, recorded in
+    .compress-manifest.json with its size and mtime so unchanged files
+    are not re-read either. zlib and brotli release the GIL, so the pool
+    is a thread pool. Returns the output-relative paths compressed.
+    """
+    manifest_path = os.path.join(dest_dir_path, COMPRESS_MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r") as manifest_file:
+            previous = json.load(manifest_file)
+    except (OSError, ValueError):
+        previous = {}
+    formats = compressors()
+    suffixes = sorted(formats)
+    files: dict[str, dict] = {}
+    stale: list[str] = []
+    for root, dirs, names in os.walk(dest_dir_path):
+        dirs.sort()
+        for name in sorted(names):
+            if name.startswith(".") or not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            if stat.st_size < min_size:
+                continue
+            rel_path = os.path.relpath(path, dest_dir_path).replace(os.sep, "/")
+            old = previous.get(rel_path)
+            digest = cached_hash(path, stat, old)
+            files[rel_path] = {
+                "hash": digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "formats": suffixes,
+            }
+            if (
+                old is None
+                or old["hash"] != digest
+                or old.get("formats") != suffixes
+                or not all(os.path.exists(path + suffix) for suffix in suffixes)
+            ):
+                stale.append(rel_path)
+    for rel_path, entry in previous.items():
+        if rel_path in files:
+            continue
+        for suffix in entry.get("formats", []):
+            if os.path.exists(os.path.join(dest_dir_path, rel_path + suffix)):
+                remove_output(dest_dir_path, rel_path + suffix)
+    paths = [os.path.join(dest_dir_path, rel_path) for rel_path in stale]
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        for path in paths:
+            compress_file(path, formats)
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            for _ in executor.map(compress_file, paths, [formats] * len(paths)):
+                pass
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as manifest_file:
+        json.dump(files, manifest_file, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return stale
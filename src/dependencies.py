@@ -0,0 +1,89 @@
+"""
+dependencies module
+
+Build dependency graph: every output page records the inputs only it
+depends on, as "kind:name" ids with a fingerprint each:
+
+    source:<content key>   hash of the page's markdown
+    template:<path>        hash of the template it was rendered with
+    asset:<path>           fingerprinted name of a static file it references
+    page:<output key>      another generated page it links to
+
+Inputs every page shares (basepath, renderer version, the set of
+fingerprinted files) are compared once per build instead.
+"""
+
+from links import resolve_ref
+
+
+def page_target(target: str, page_keys: set[str]) -> str | None:
+    """Output key of the generated page a resolved reference points at"""
+    if target == "":
+        candidates = ("index.html",)
+    else:
+        candidates = (target, f"{target}/index.html", f"{target}.html")
+    for candidate in candidates:
+        if candidate in page_keys:
+            return candidate
+    return None
+
+
+def page_inputs(
+    page_key: str,
+    refs: list[str],
+    inputs: dict[str, str],
+    assets: dict[str, str] | None,
+    page_keys: set[str],
+) -> dict[str, str]:
+    """inputs plus the assets and pages a page's references point at
+
+    Assets are only recorded with an asset map, since without
+    fingerprinting a page's HTML does not change with them.
+    """
+    inputs = dict(inputs)
+    for ref in refs:
+        target = resolve_ref(page_key, ref)
+        if target is None:
+            continue
+        if assets and target in assets:
+            inputs[f"asset:{target}"] = assets[target]
+            continue
+        page = page_target(target, page_keys)
+        if page is not None and page != page_key:
+            inputs[f"page:{page}"] = "1"
+    return inputs
+
+
+class DependencyGraph:
+    """
+    DependencyGraph Class
+
+    Outputs indexed by the inputs they depend on, grouped by the
+    fingerprint each input had when the output was built, so finding
+    what a change invalidates compares each distinct fingerprint once.
+    """
+
+    def __init__(self):
+        self.dependents: dict[str, dict[str, set[str]]] = {}
+
+    def add(self, output: str, inputs: dict[str, str]):
+        for input_id, fingerprint in inputs.items():
+            self.dependents.setdefault(input_id, {}).setdefault(fingerprint, set()).add(output)
+
+    def invalidated(self, current: dict[str, str]) -> dict[str, list[str]]:
+        """Outputs with an input whose fingerprint changed, and those inputs
+
+        current maps every input id that exists now to its fingerprint;
+        an input missing from it counts as changed.
+        """
+        stale: dict[str, list[str]] = {}
+        for input_id, by_fingerprint in self.dependents.items():
+            fingerprint = current.get(input_id)
+            for recorded, outputs in by_fingerprint.items():
+                if recorded == fingerprint:
+                    continue
+                for output in outputs:
+                    stale.setdefault(output, []).append(input_id)
+        for changed in stale.values():
+            changed.sort()
+        return stale
@@ -0,0 +1,39 @@
+"""
+fixtures module
+
+Helpers shared by the test modules.
+"""
+
+import os
+import tracemalloc
+
+
+def write_file(path: str, text: str):
+    """Write a text file, creating its parent directories"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+
+
+def write_bytes(path: str, data: bytes):
+    """Write a binary file, creating its parent directories"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def read_file(path: str) -> str:
+    with open(path, "r") as file:
+        return file.read()
+
+
+def bytes_per_instance(factory, count=2000):
+    """Average bytes allocated per object made by factory(i)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    nodes = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del nodes
+    return size / count
@@ -0,0 +1,171 @@
+"""
+frontmatter module
+
+YAML-style front matter at the top of a page, between two "---" lines:
+
+    ---
+    title: Why Tom Bombadil Was a Mistake
+    date: 2024-01-31
+    draft: false
+    template: layouts/post.html
+    tags: [tolkien, opinion]
+    ---
+
+Only flat "key: value" lines are read, plus lists written inline or as
+"- item" lines. Unknown keys are ignored.
+"""
+
+import datetime
+import io
+
+FRONT_MATTER_DELIMITER = "---"
+TRUE_VALUES = frozenset(("true", "yes", "on"))
+FALSE_VALUES = frozenset(("false", "no", "off"))
+
+
+class FrontMatter:
+    """
+    FrontMatter Class
+
+    Metadata of one page; fields a page does not set are None, or false
+    and empty for draft and tags.
+    """
+
+    __slots__ = ("title", "date", "draft", "template", "tags")
+
+    def __init__(
+        self,
+        title: str | None = None,
+        date: datetime.date | None = None,
+        draft: bool = False,
+        template: str | None = None,
+        tags: list[str] | None = None,
+    ):
+        self.title = title
+        self.date = date
+        self.draft = draft
+        self.template = template
+        self.tags = tags if tags is not None else []
+
+    def __eq__(self, other):
+        if not isinstance(other, FrontMatter):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"FrontMatter({fields})"
+
+
+def _scalar(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _list(value: str) -> list[str]:
+    if not (value.startswith("[") and value.endswith("]")):
+        return [_scalar(value)]
+    return [_scalar(item.strip()) for item in value[1:-1].split(",") if item.strip()]
+
+
+def _bool(key: str, value: str) -> bool:
+    lowered = value.lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError(f"front matter {key} must be true or false: {value!r}")
+
+
+def _date(value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.datetime.fromisoformat(value).date()
+    except ValueError:
+        raise ValueError(f"front matter date must be an ISO date: {value!r}") from None
+
+
+def parse_front_matter(lines: list[str]) -> FrontMatter:
+    """FrontMatter of the lines between the two delimiters"""
+    fields: dict[str, str | list[str]] = {}
+    list_key = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and list_key is not None:
+            fields[list_key].append(_scalar(stripped[2:].strip()))
+            continue
+        key, colon, value = stripped.partition(":")
+        if not colon or not key.strip():
+            raise ValueError(f"invalid front matter line: {line!r}")
+        key, value = key.strip(), value.strip()
+        list_key = None
+        if not value:
+            fields[key] = []
+            list_key = key
+        else:
+            fields[key] = value
+    front_matter = FrontMatter()
+    for key, value in fields.items():
+        if key == "tags":
+            front_matter.tags = value if isinstance(value, list) else _list(value)
+        elif isinstance(value, list):
+            continue
+        elif key == "title":
+            front_matter.title = _scalar(value)
+        elif key == "date":
+            front_matter.date = _date(_scalar(value))
+        elif key == "draft":
+            front_matter.draft = _bool(key, _scalar(value))
+        elif key == "template":
+            front_matter.template = _scalar(value)
+    return front_matter
+
+
+def read_front_matter(fp) -> FrontMatter:
+    """Read the front matter at the start of a text file object
+
+    Reading stops at the closing delimiter, leaving fp at the first line
+    of the body. Without front matter (no opening delimiter, or one that
+    is never closed) fp is rewound and an empty FrontMatter returned.
+    Invalid front matter raises ValueError naming fp's file.
+    """
+    start = fp.tell()
+    if fp.readline().rstrip("\r\n") != FRONT_MATTER_DELIMITER:
+        fp.seek(start)
+        return FrontMatter()
+    lines: list[str] = []
+    while True:
+        line = fp.readline()
+        if not line:
+            fp.seek(start)
+            return FrontMatter()
+        if line.rstrip("\r\n") == FRONT_MATTER_DELIMITER:
+            try:
+                return parse_front_matter(lines)
+            except ValueError as err:
+                name = getattr(fp, "name", None)
+                if name is None:
+                    raise
+                raise ValueError(f"invalid front matter in '{name}': {err}") from err
+        lines.append(line)
+
+
+def read_front_matter_file(path: str) -> FrontMatter:
+    """Front matter of a page file, reading nothing past it"""
+    with open(path, "r") as content_file:
+        return read_front_matter(content_file)
+
+
+def split_front_matter(markdown: str) -> tuple[FrontMatter, str]:
+    """Front matter and body of a page held in memory"""
+    if not markdown.startswith(FRONT_MATTER_DELIMITER):
+        return FrontMatter(), markdown
+    reader = io.StringIO(markdown)
+    front_matter = read_front_matter(reader)
+    return front_matter, markdown[reader.tell() :]
@@ -2,12 +2,60 @@
 HTMLNode Module
 """
 
+from functools import lru_cache
+
+_TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_ATTRIBUTE_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
+class SafeString(str):
+    """
+    SafeString Class
+
+    A string that is already HTML, such as a cached fragment, and is
+    never escaped again.
+    """
+
+    __slots__ = ()
+
+
+def escape_html(text) -> str:
+    """Escape &, < and > in text content; safe and plain strings are returned as is
+
+    Values other than strings are converted with str first.
+    """
+    if not isinstance(text, str):
+        text = str(text)
+    if isinstance(text, SafeString) or not ("&" in text or "<" in text or ">" in text):
+        return text
+    return text.translate(_TEXT_ESCAPES)
+
+
+def escape_attribute(value) -> str:
+    """Escape a value for a double-quoted attribute"""
+    if not isinstance(value, str):
+        value = str(value)
+    if isinstance(value, SafeString) or not (
+        "&" in value or "<" in value or ">" in value or '"' in value
+    ):
+        return value
+    return value.translate(_ATTRIBUTE_ESCAPES)
+
+
+@lru_cache(maxsize=4096)
+def _serialize_props(items: tuple) -> str:
+    return "".join(
+        f' {key}="{value if safe else escape_attribute(value)}"' for key, value, safe in items
+    )
+
 
 class HTMLNode:
     """
     HTMLNode Class
     """
 
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -18,18 +66,38 @@ class HTMLNode:
         """
         to_html method
         """
+        return "".join(self.iter_html())
+
+    def iter_html(self):
+        """
+        iter_html method: yield the HTML as a stream of string chunks
+        """
         raise NotImplementedError
 
+    def write_html(self, fp):
+        """
+        write_html method: stream the HTML into a text file object
+        """
+        fp.writelines(self.iter_html())
+
     def props_to_html(self):
         """
         props_to_html method
+
+        Values are escaped for double-quoted attributes. The serialized
+        string is cached per distinct props, since the same links and
+        images recur across pages. The cache is keyed on each value's
+        string form, so values of any type serialize as str() would, and
+        on whether it is a SafeString, which equals the plain string.
         """
-        if self.props is not None:
-            props_list = []
-            for key, value in self.props.items():
-                props_list.append(f' {key}="{value}"')
-            return "".join(props_list)
-        return ""
+        if not self.props:
+            return ""
+        return _serialize_props(
+            tuple(
+                (key, value, True) if isinstance(value, SafeString) else (key, str(value), False)
+                for key, value in self.props.items()
+            )
+        )
 
     def __repr__(self):
         """
@@ -2,7 +2,7 @@
 LeafNode Module
 """
 
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, escape_html
 
 
 class LeafNode(HTMLNode):
@@ -10,15 +10,23 @@ class LeafNode(HTMLNode):
     LeafNode Class
     """
 
+    __slots__ = ()
+
     def __init__(self, tag=None, value=None, props=None):
-        super().__init__(tag=tag, value=value, props=props)
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
 
     def to_html(self) -> str:
         if self.value is None:
             raise ValueError("invalid HTML: no value")
         if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return escape_html(self.value)
+        return f"<{self.tag}{self.props_to_html()}>{escape_html(self.value)}</{self.tag}>"
+
+    def iter_html(self):
+        yield self.to_html()
 
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
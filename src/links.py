@@ -0,0 +1,115 @@
+"""
+links module
+"""
+
+import json
+import os
+import posixpath
+import re
+
+REF_PATTERN = re.compile(r'(?:href|src)="([^"]*)"')
+SCHEME_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+def find_refs(html: str) -> list[str]:
+    """Every href and src value in a piece of HTML"""
+    if "=" not in html:
+        return []
+    return REF_PATTERN.findall(html)
+
+
+def collect_refs(chunks, refs: list[str]):
+    """Pass HTML chunks through, appending their href/src values to refs"""
+    for chunk in chunks:
+        refs.extend(find_refs(chunk))
+        yield chunk
+
+
+def resolve_ref(page_path: str, ref: str) -> str | None:
+    """Output-relative path a reference points at, or None if it is external
+
+    Root-relative refs ("/blog/tom") resolve against the output root and
+    other refs against the page's directory. A path that climbs out of
+    the output root keeps its leading "..".
+    """
+    if not ref or ref.startswith(("#", "//")) or SCHEME_PATTERN.match(ref):
+        return None
+    path = ref.split("#", 1)[0].split("?", 1)[0]
+    if path.startswith("/"):
+        path = path.lstrip("/")
+    else:
+        path = posixpath.join(posixpath.dirname(page_path), path)
+    if not path:
+        return ""
+    path = posixpath.normpath(path)
+    return "" if path == "." else path
+
+
+class LinkIndex:
+    """
+    LinkIndex Class
+
+    Outgoing href/src references of every generated page, keyed by the
+    page's path relative to the output directory.
+    """
+
+    def __init__(self, dest_dir_path: str = ""):
+        self.dest_dir_path = dest_dir_path
+        self.pages: dict[str, list[str]] = {}
+
+    def page_key(self, dest_path: str) -> str:
+        if self.dest_dir_path:
+            dest_path = os.path.relpath(dest_path, self.dest_dir_path)
+        return dest_path.replace(os.sep, "/")
+
+    def add(self, dest_path: str, refs: list[str]):
+        self.pages[self.page_key(dest_path)] = refs
+
+    def broken(self, known_paths: set[str]) -> list[tuple[str, str]]:
+        """(page, ref) pairs whose internal target is not in known_paths
+
+        known_paths holds output-relative paths of generated pages and
+        static assets. A ref to a directory matches its index.html and an
+        extensionless ref also matches the same name plus ".html".
+        """
+        broken: list[tuple[str, str]] = []
+        resolved: dict[tuple[str, str], bool] = {}
+        for page, refs in sorted(self.pages.items()):
+            page_dir = posixpath.dirname(page)
+            for ref in refs:
+                key = (page_dir, ref)
+                ok = resolved.get(key)
+                if ok is None:
+                    ok = target_exists(resolve_ref(page, ref), known_paths)
+                    resolved[key] = ok
+                if not ok:
+                    broken.append((page, ref))
+        return broken
+
+    def write_json(self, path: str):
+        with open(path, "w") as index_file:
+            json.dump(self.pages, index_file, indent=1, sort_keys=True)
+
+
+def target_exists(target: str | None, known_paths: set[str]) -> bool:
+    if target is None:
+        return True
+    if target == ".." or target.startswith("../"):
+        return False
+    if target == "":
+        return "index.html" in known_paths
+    return (
+        target in known_paths
+        or f"{target}/index.html" in known_paths
+        or f"{target}.html" in known_paths
+    )
+
+
+def static_paths(static_dir: str) -> set[str]:
+    """Output-relative paths of every file under a static directory"""
+    paths: set[str] = set()
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            rel_path = os.path.relpath(os.path.join(root, name), static_dir)
+            paths.add(rel_path.replace(os.sep, "/"))
+    return paths
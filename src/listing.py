@@ -0,0 +1,182 @@
+"""
+listing module
+
+Index pages generated for content directories without an index.md of
+their own, listing the pages directly below them.
+"""
+
+import datetime
+import os
+import posixpath
+
+from frontmatter import FrontMatter
+from leafnode import LeafNode
+from links import LinkIndex, find_refs
+from parentnode import ParentNode
+from search import page_url
+from template import TemplateResolver
+from utils import iter_content_pages, read_page_meta, remove_output, write_atomic
+
+INDEX_NAME = "index.md"
+LISTING_PAGE_SIZE = 20
+LISTING_PAGE_DIR = "page"
+LISTING_SORT_KEYS = ("title", "path", "date")
+
+
+def listing_title(directory: str) -> str:
+    """Title of a generated listing: blog/fan-fiction -> Fan Fiction"""
+    name = posixpath.basename(directory)
+    if not name:
+        return "Home"
+    return name.replace("-", " ").replace("_", " ").title()
+
+
+def listing_page_key(directory: str, number: int) -> str:
+    """Output key of a listing page: blog/index.html, blog/page/2/index.html"""
+    if number == 1:
+        return posixpath.join(directory, "index.html")
+    return posixpath.join(directory, LISTING_PAGE_DIR, str(number), "index.html")
+
+
+def collect_listings(
+    dir_path_content: str, dest_dir_path: str, drafts: bool = False
+) -> dict[str, list[tuple[str, str, datetime.date | None]]]:
+    """Map every directory needing a listing to its (title, page key, date) entries
+
+    Directories are content-relative with "/" separators, "" being the
+    content root. A directory gets a listing when it has pages below it
+    but no index.md; its entries are its markdown files and the index
+    pages of its subdirectories, generated listings included. Drafts
+    are left out unless drafts is set. Titles and dates come from one
+    pass over the head of each source (see read_page_meta).
+    """
+    indexed: set[str] = set()
+    # directory -> (front matter, or None for a generated listing, page key)
+    children: dict[str, list[tuple[FrontMatter | None, str]]] = {}
+    for src_path, dest_path in iter_content_pages(dir_path_content, dest_dir_path):
+        front_matter = read_page_meta(src_path)
+        if front_matter.draft and not drafts:
+            continue
+        rel_path = os.path.relpath(src_path, dir_path_content).replace(os.sep, "/")
+        page_key = os.path.relpath(dest_path, dest_dir_path).replace(os.sep, "/")
+        directory, name = posixpath.split(rel_path)
+        if name == INDEX_NAME:
+            indexed.add(directory)
+            if not directory:
+                continue
+            directory = posixpath.dirname(directory)
+        children.setdefault(directory, []).append((front_matter, page_key))
+    directories: set[str] = set()
+    for directory in list(children):
+        while directory not in directories:
+            directories.add(directory)
+            if not directory:
+                break
+            directory = posixpath.dirname(directory)
+    listed = directories - indexed
+    for directory in listed:
+        if directory:
+            children.setdefault(posixpath.dirname(directory), []).append(
+                (None, listing_page_key(directory, 1))
+            )
+    listings: dict[str, list[tuple[str, str, datetime.date | None]]] = {}
+    for directory in listed:
+        entries = listings[directory] = []
+        for front_matter, page_key in children[directory]:
+            if front_matter is None:
+                entries.append((listing_title(posixpath.dirname(page_key)), page_key, None))
+            else:
+                entries.append((front_matter.title, page_key, front_matter.date))
+    return listings
+
+
+def sort_entries(entries: list[tuple], sort: str = "title", reverse: bool = False):
+    """Sort (title, page key, date) entries in place by title, path or date
+
+    By date, undated entries come after dated ones, by path.
+    """
+    if sort == "title":
+        entries.sort(key=lambda entry: (entry[0].casefold(), entry[1]), reverse=reverse)
+    elif sort == "path":
+        entries.sort(key=lambda entry: entry[1], reverse=reverse)
+    elif sort == "date":
+        dated = sorted(
+            (entry for entry in entries if entry[2] is not None),
+            key=lambda entry: (entry[2], entry[1]),
+            reverse=reverse,
+        )
+        undated = sorted((entry for entry in entries if entry[2] is None), key=lambda entry: entry[1])
+        entries[:] = dated + undated
+    else:
+        raise ValueError(f"unknown listing sort: {sort}")
+
+
+def render_listing(directory: str, entries: list[tuple], number: int, page_count: int) -> str:
+    """HTML of one listing page: its entries and links to the pages beside it"""
+    items = []
+    for title, page_key, date in entries:
+        item = [LeafNode("a", title, {"href": page_url("/", page_key)})]
+        if date is not None:
+            item.append(LeafNode("time", date.isoformat(), {"datetime": date.isoformat()}))
+        items.append(ParentNode("li", item))
+    children = [ParentNode("ul", items)]
+    if page_count > 1:
+        nav = []
+        if number > 1:
+            href = page_url("/", listing_page_key(directory, number - 1))
+            nav.append(LeafNode("a", "Previous", {"href": href, "rel": "prev"}))
+        nav.append(LeafNode("span", f"Page {number} of {page_count}"))
+        if number < page_count:
+            href = page_url("/", listing_page_key(directory, number + 1))
+            nav.append(LeafNode("a", "Next", {"href": href, "rel": "next"}))
+        children.append(ParentNode("nav", nav))
+    return ParentNode("div", children, {"class": "listing"}).to_html()
+
+
+def generate_listings(
+    dir_path_content: str,
+    template_path: str,
+    dest_dir_path: str,
+    basepath: str = "/",
+    page_size: int = LISTING_PAGE_SIZE,
+    sort: str = "title",
+    reverse: bool = False,
+    assets: dict[str, str] | None = None,
+    links: LinkIndex | None = None,
+    drafts: bool = False,
+) -> list[str]:
+    """Write the listing pages of a content directory into dest_dir_path
+
+    Each listing is split into pages of page_size entries (0 puts every
+    entry on one page) and renders with the template its index.md would
+    use. Pages left over from a longer listing are removed. Returns the
+    paths written.
+    """
+    templates = TemplateResolver(template_path, dir_path_content, basepath, assets)
+    written: list[str] = []
+    listings = collect_listings(dir_path_content, dest_dir_path, drafts)
+    for directory, entries in sorted(listings.items()):
+        sort_entries(entries, sort, reverse)
+        title = listing_title(directory)
+        listing_template_path, template = templates.resolve(
+            os.path.join(dir_path_content, directory, INDEX_NAME)
+        )
+        per_page = page_size if page_size > 0 else len(entries)
+        page_count = (len(entries) + per_page - 1) // per_page
+        for number in range(1, page_count + 1):
+            content = render_listing(
+                directory, entries[(number - 1) * per_page : number * per_page], number, page_count
+            )
+            page = template.render(title if number == 1 else f"{title} (page {number})", content)
+            dest_path = os.path.join(dest_dir_path, listing_page_key(directory, number))
+            print(f"Generating listing '{dest_path}' using template '{listing_template_path}'")
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            write_atomic(dest_path, lambda dest_file: dest_file.write(page))
+            if links is not None:
+                links.add(dest_path, template.refs + find_refs(content))
+            written.append(dest_path)
+        number = page_count + 1
+        while os.path.exists(os.path.join(dest_dir_path, listing_page_key(directory, number))):
+            remove_output(dest_dir_path, listing_page_key(directory, number))
+            number += 1
+    return written
@@ -2,19 +2,265 @@
 main module
 """
 
-from utils import copy_static_to_dir, generate_pages_recursive
+from utils import copy_static_to_dir, sync_static_to_dir
+from build import collect_pages, generate_pages, generate_pages_incremental
+from profiling import BuildStats
+from block_cache import BlockCache
+from parse_cache import ParseCache
+from links import LinkIndex, static_paths
+from assets import fingerprint_static
+from template import normalize_basepath
+from compress import MIN_COMPRESS_SIZE, precompress_dir
+from search import SEARCH_DIR_NAME, SearchIndex
+from listing import LISTING_PAGE_SIZE, LISTING_SORT_KEYS, generate_listings
+import argparse
+import os
 import sys
 
 
+def parse_args(argv=None):
+    """
+    parse command line arguments
+    """
+    parser = argparse.ArgumentParser(description="Build the static site")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rebuild pages whose inputs changed since the last build"
+        " and only copy static files that changed",
+    )
+    parser.add_argument(
+        "--link-static",
+        action="store_true",
+        help="hardlink static files into the output instead of copying (with --incremental)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="render pages on N worker processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="limit parallel builds to the pages estimated to fit in MB of memory at once",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="overlap reading and writing pages on N threads while rendering in order"
+        " (for slow or network storage; not with --jobs or --profile)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-stage totals and the slowest pages after the build",
+    )
+    parser.add_argument(
+        "--stats-json",
+        metavar="PATH",
+        help="write per-stage totals and the slowest pages as JSON",
+    )
+    parser.add_argument(
+        "--block-cache",
+        action="store_true",
+        help="reuse the rendered HTML of unchanged blocks between builds",
+    )
+    parser.add_argument(
+        "--block-cache-mb",
+        type=int,
+        default=64,
+        metavar="MB",
+        help="size cap of the block cache (least recently used blocks are evicted)",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="load the parsed node tree of unchanged pages instead of parsing them",
+    )
+    parser.add_argument(
+        "--parse-cache-mb",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="size cap of the parse cache (least recently used pages are removed)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".cache",
+        help="directory for caches kept between builds",
+    )
+    parser.add_argument(
+        "--check-links",
+        action="store_true",
+        help="report internal links to pages or static files that do not exist",
+    )
+    parser.add_argument(
+        "--link-index",
+        metavar="PATH",
+        help="write every page's outgoing links as JSON",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="also write static files under content-hashed names and point pages at them",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help=f"write a sharded client-side search index to {SEARCH_DIR_NAME}/ in the output",
+    )
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also build pages marked draft in their front matter",
+    )
+    parser.add_argument(
+        "--listings",
+        action="store_true",
+        help="generate an index page listing the pages of every content directory"
+        " without an index.md",
+    )
+    parser.add_argument(
+        "--listing-page-size",
+        type=int,
+        default=LISTING_PAGE_SIZE,
+        metavar="N",
+        help="entries per listing page (0 = one page)",
+    )
+    parser.add_argument(
+        "--listing-sort",
+        choices=LISTING_SORT_KEYS,
+        default="title",
+        help="order of listing entries",
+    )
+    parser.add_argument(
+        "--listing-reverse",
+        action="store_true",
+        help="list entries in descending order",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="write .gz (and .br with brotli installed) siblings of text output files",
+    )
+    parser.add_argument(
+        "--compress-min-bytes",
+        type=int,
+        default=MIN_COMPRESS_SIZE,
+        metavar="N",
+        help="leave files smaller than N bytes uncompressed",
+    )
+    args = parser.parse_args(argv)
+    if args.io_workers and (args.jobs != 1 or args.profile or args.stats_json):
+        parser.error("--io-workers cannot be combined with --jobs, --profile or --stats-json")
+    return args
+
+
 def main():
     """
     main program
     """
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+    args = parse_args()
+    basepath = args.basepath
     # For local testing, build into docs per assignment
     output_dir = "docs"
-    copy_static_to_dir(output_dir)
-    generate_pages_recursive("content", "template.html", output_dir, basepath)
+    memory_budget = args.memory_budget * 1024 * 1024 if args.memory_budget else None
+    stats = BuildStats() if args.profile or args.stats_json else None
+    cache = None
+    if args.block_cache:
+        cache = BlockCache.load(
+            os.path.join(args.cache_dir, "blocks.json"), args.block_cache_mb * 1024 * 1024
+        )
+    parse_cache = ParseCache(os.path.join(args.cache_dir, "parsed")) if args.parse_cache else None
+    links = LinkIndex(output_dir) if args.check_links or args.link_index else None
+    search = SearchIndex(output_dir, normalize_basepath(basepath)) if args.search_index else None
+    if args.incremental:
+        sync_static_to_dir(output_dir, link=args.link_static)
+        assets = None
+        if args.fingerprint:
+            assets = fingerprint_static("./static", output_dir, args.link_static)
+        generate_pages_incremental(
+            "content",
+            "template.html",
+            output_dir,
+            basepath,
+            jobs=args.jobs,
+            stats=stats,
+            cache=cache,
+            links=links,
+            assets=assets,
+            memory_budget=memory_budget,
+            io_workers=args.io_workers,
+            search=search,
+            parse_cache=parse_cache,
+            drafts=args.drafts,
+        )
+    else:
+        copy_static_to_dir(output_dir)
+        assets = None
+        if args.fingerprint:
+            assets = fingerprint_static("./static", output_dir, args.link_static)
+        page_templates: dict[str, str] = {}
+        pages = collect_pages("content", output_dir, args.drafts, page_templates)
+        generate_pages(
+            pages,
+            "template.html",
+            basepath,
+            jobs=args.jobs,
+            stats=stats,
+            cache=cache,
+            links=links,
+            assets=assets,
+            memory_budget=memory_budget,
+            io_workers=args.io_workers,
+            search=search,
+            parse_cache=parse_cache,
+            content_dir="content",
+            page_templates=page_templates,
+        )
+    if args.listings:
+        generate_listings(
+            "content",
+            "template.html",
+            output_dir,
+            basepath,
+            page_size=args.listing_page_size,
+            sort=args.listing_sort,
+            reverse=args.listing_reverse,
+            assets=assets,
+            links=links,
+            drafts=args.drafts,
+        )
+    if search is not None:
+        search.write(os.path.join(output_dir, SEARCH_DIR_NAME))
+    if args.precompress:
+        precompress_dir(output_dir, args.jobs, args.compress_min_bytes)
+    if cache is not None:
+        cache.save()
+    if parse_cache is not None:
+        parse_cache.prune(args.parse_cache_mb * 1024 * 1024)
+    if stats is not None:
+        stats.finish()
+        if args.profile:
+            print(stats.report())
+        if args.stats_json:
+            stats.write_json(args.stats_json)
+    if links is not None:
+        if args.link_index:
+            links.write_json(args.link_index)
+        if args.check_links:
+            broken = links.broken(set(links.pages) | static_paths("./static"))
+            for page, ref in broken:
+                print(f"Broken link in '{page}': {ref}")
+            if broken:
+                sys.exit(1)
 
 if __name__ == "__main__":
     main()
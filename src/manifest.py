@@ -0,0 +1,102 @@
+"""
+manifest module
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".build-manifest.json"
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex sha256 digest of some bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str, buffer_size: int = 1024 * 1024) -> str:
+    """Return the hex sha256 digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(buffer_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_hash(path: str, stat: os.stat_result, old_entry: dict | None) -> str:
+    """Return the hash of a file, reusing old_entry's while size and mtime match
+
+    old_entry is the file's manifest entry from the previous run, with
+    "hash", "size" and "mtime_ns" keys, or None.
+    """
+    if (
+        old_entry is not None
+        and old_entry.get("size") == stat.st_size
+        and old_entry.get("mtime_ns") == stat.st_mtime_ns
+    ):
+        return old_entry["hash"]
+    return hash_file(path)
+
+
+class BuildManifest:
+    """
+    BuildManifest Class
+
+    Records the inputs of the last build in the output directory:
+    `inputs` holds the build-wide inputs (basepath, renderer version,
+    fingerprinted file set) and `pages` maps each source (relative to
+    the content dir) to its output (relative to the output dir), content
+    hash and the per-page inputs it was built from.
+
+    Callers replace `inputs` and `pages` with new dicts rather than
+    mutating the loaded ones, so save() can tell whether anything
+    changed by comparing against what was loaded.
+    """
+
+    def __init__(self, path: str, inputs: dict | None = None, pages: dict | None = None):
+        self.path = path
+        self.inputs = inputs if inputs is not None else {}
+        self.pages = pages if pages is not None else {}
+        self._saved: tuple[dict, dict] | None = None
+
+    @classmethod
+    def load(cls, dest_dir_path: str) -> "BuildManifest":
+        """Load the manifest from an output dir, or start an empty one"""
+        path = os.path.join(dest_dir_path, MANIFEST_NAME)
+        try:
+            with open(path, "r") as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError):
+            return cls(path)
+        manifest = cls(path, data.get("inputs", {}), data.get("pages", {}))
+        manifest._saved = (manifest.inputs, manifest.pages)
+        return manifest
+
+    def save(self):
+        """Write the manifest atomically, unless it is unchanged on disk"""
+        if self._saved == (self.inputs, self.pages):
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as manifest_file:
+            json.dump(
+                {"inputs": self.inputs, "pages": self.pages},
+                manifest_file,
+                separators=(",", ":"),
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+        self._saved = (self.inputs, self.pages)
+
+    def source_entry(self, key: str, path: str) -> dict:
+        """Build the manifest entry for a source file
+
+        The hash from the previous build is reused when size and mtime
+        are unchanged, so unchanged files are never re-read.
+        """
+        stat = os.stat(path)
+        digest = cached_hash(path, stat, self.pages.get(key))
+        return {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
@@ -0,0 +1,187 @@
+"""
+node_codec module
+
+Compact binary form of HTMLNode trees and TextNode lists: every
+distinct string is stored once in a table, and nodes are a flat
+preorder list of 32-bit ints indexing it.
+"""
+
+import struct
+import sys
+from array import array
+
+from htmlnode import HTMLNode, SafeString
+from leafnode import LeafNode
+from parentnode import ParentNode
+from textnode import TextNode, TextType
+
+MAGIC = b"SSGN"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBII")
+KIND_TREE = 0
+KIND_TEXT_NODES = 1
+
+# record kinds of a tree
+LEAF = 0
+SAFE_LEAF = 1
+PARENT = 2
+
+TEXT_TYPES = list(TextType)
+TEXT_TYPE_CODES = {text_type: code for code, text_type in enumerate(TEXT_TYPES)}
+
+
+class StringTable:
+    """
+    StringTable Class
+
+    Index of every distinct string added; None is stored as -1.
+    """
+
+    __slots__ = ("strings", "indexes")
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self.indexes: dict[str, int] = {}
+
+    def add(self, value) -> int:
+        if value is None:
+            return -1
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _pack(kind: int, table: StringTable, records: array) -> bytes:
+    lengths = array("I", map(len, table.strings))
+    if sys.byteorder == "big":
+        lengths.byteswap()
+        records.byteswap()
+    return b"".join(
+        (
+            HEADER.pack(MAGIC, FORMAT_VERSION, kind, len(lengths), len(records)),
+            lengths.tobytes(),
+            records.tobytes(),
+            "".join(table.strings).encode(),
+        )
+    )
+
+
+def _unpack(data: bytes, kind: int) -> tuple[list[str], array]:
+    magic, version, data_kind, string_count, record_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION or data_kind != kind:
+        raise ValueError("not an encoded node tree of this version")
+    offset = HEADER.size
+    lengths = array("I")
+    lengths.frombytes(data[offset : offset + 4 * string_count])
+    offset += 4 * string_count
+    records = array("i")
+    records.frombytes(data[offset : offset + 4 * record_count])
+    offset += 4 * record_count
+    if sys.byteorder == "big":
+        lengths.byteswap()
+        records.byteswap()
+    text = data[offset:].decode()
+    strings: list[str] = []
+    position = 0
+    for length in lengths:
+        strings.append(text[position : position + length])
+        position += length
+    return strings, records
+
+
+def encode_tree(node: HTMLNode) -> bytes:
+    """Encode a LeafNode/ParentNode tree"""
+    table = StringTable()
+    add = table.add
+    records = array("i")
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ParentNode):
+            records.extend((PARENT, add(node.tag)))
+        else:
+            kind = SAFE_LEAF if isinstance(node.value, SafeString) else LEAF
+            records.extend((kind, add(node.tag), add(node.value)))
+        props = node.props or {}
+        records.append(len(props))
+        for key, value in props.items():
+            records.extend((add(key), add(str(value))))
+        if isinstance(node, ParentNode):
+            records.append(len(node.children))
+            stack.extend(reversed(node.children))
+    return _pack(KIND_TREE, table, records)
+
+
+def decode_tree(data: bytes) -> HTMLNode:
+    """Rebuild the tree encode_tree encoded"""
+    strings, records = _unpack(data, KIND_TREE)
+    root = None
+    # (children list being filled, children still to read)
+    stack: list[list] = []
+    position = 0
+    while position < len(records):
+        kind = records[position]
+        tag = records[position + 1]
+        tag = strings[tag] if tag >= 0 else None
+        if kind == PARENT:
+            position += 2
+        else:
+            value = records[position + 2]
+            value = strings[value] if value >= 0 else None
+            if kind == SAFE_LEAF:
+                value = SafeString(value)
+            position += 3
+        prop_count = records[position]
+        position += 1
+        props = None
+        if prop_count:
+            props = {}
+            for _ in range(prop_count):
+                props[strings[records[position]]] = strings[records[position + 1]]
+                position += 2
+        if kind == PARENT:
+            child_count = records[position]
+            position += 1
+            node = ParentNode(tag, [], props)
+        else:
+            node = LeafNode(tag, value, props)
+        if stack:
+            frame = stack[-1]
+            frame[0].append(node)
+            frame[1] -= 1
+            if frame[1] == 0:
+                stack.pop()
+        else:
+            root = node
+        if kind == PARENT and child_count:
+            stack.append([node.children, child_count])
+    return root
+
+
+def encode_text_nodes(nodes: list[TextNode]) -> bytes:
+    """Encode a list of TextNodes"""
+    table = StringTable()
+    records = array("i")
+    for node in nodes:
+        records.extend(
+            (table.add(node.text), TEXT_TYPE_CODES[node.text_type], table.add(node.url))
+        )
+    return _pack(KIND_TEXT_NODES, table, records)
+
+
+def decode_text_nodes(data: bytes) -> list[TextNode]:
+    """Rebuild the list encode_text_nodes encoded"""
+    strings, records = _unpack(data, KIND_TEXT_NODES)
+    nodes: list[TextNode] = []
+    for position in range(0, len(records), 3):
+        url = records[position + 2]
+        nodes.append(
+            TextNode(
+                strings[records[position]],
+                TEXT_TYPES[records[position + 1]],
+                strings[url] if url >= 0 else None,
+            )
+        )
+    return nodes
@@ -4,25 +4,52 @@ parentnode module
 
 from htmlnode import HTMLNode
 
+_END = object()
+
 
 class ParentNode(HTMLNode):
     """
     ParendNode Class
     """
 
+    __slots__ = ()
+
     def __init__(self, tag=None, children=None, props=None):
-        super().__init__(tag=tag, children=children, props=props)
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props
+
+    def iter_html(self):
+        """
+        iter_html method
+
+        Walks the subtree with an explicit stack, so every chunk is
+        yielded once instead of being copied into each ancestor's string.
+        """
+        yield self.open_tag()
+        stack = [(self, iter(self.children))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, _END)
+            if child is _END:
+                stack.pop()
+                yield f"</{node.tag}>"
+            elif isinstance(child, ParentNode):
+                yield child.open_tag()
+                stack.append((child, iter(child.children)))
+            else:
+                yield from child.iter_html()
 
-    def to_html(self):
+    def open_tag(self) -> str:
+        """
+        open_tag method: validate the node and return its opening tag
+        """
         if self.tag is None:
             raise ValueError("Parent node must have a tag")
         if self.children is None:
             raise ValueError("Parent node must have children")
-        output = f"<{self.tag}{self.props_to_html()}>"
-        for child in self.children:
-            output += child.to_html()
-        output += f"</{self.tag}>"
-        return output
+        return f"<{self.tag}{self.props_to_html()}>"
 
     def __repr__(self):
         return f"ParentNode({self.tag}, children: {self.children}, {self.props})"
@@ -0,0 +1,92 @@
+"""
+parse_cache module
+"""
+
+import os
+import struct
+
+from block_cache import CACHE_VERSION
+from htmlnode import HTMLNode
+from manifest import hash_bytes
+from node_codec import FORMAT_VERSION, decode_tree, encode_tree
+
+TITLE_LENGTH = struct.Struct("<I")
+
+
+def parse_key(md_content: str) -> str:
+    """Cache key of a page source"""
+    return hash_bytes(md_content.encode())
+
+
+class ParseCache:
+    """
+    ParseCache Class
+
+    Title and encoded node tree of every parsed page, one file per
+    source hash, so an unchanged page is loaded instead of parsed. Files
+    are written atomically, so worker processes share the directory
+    without coordination. Entries live under a directory named after
+    the renderer and codec versions, so a bump of either starts fresh.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries_path = os.path.join(path, f"v{CACHE_VERSION}.{FORMAT_VERSION}")
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.entries_path, key[:2], key)
+
+    def get(self, key: str) -> tuple[str, HTMLNode] | None:
+        """Return the (title, tree) stored for a key, or None"""
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                data = entry_file.read()
+            (title_length,) = TITLE_LENGTH.unpack_from(data)
+            offset = TITLE_LENGTH.size + title_length
+            title = data[TITLE_LENGTH.size : offset].decode()
+            node = decode_tree(data[offset:])
+        except (OSError, ValueError, struct.error):
+            return None
+        # mark as recently used for prune
+        os.utime(path)
+        return title, node
+
+    def put(self, key: str, title: str, node: HTMLNode):
+        path = self.entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        title_bytes = title.encode()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as entry_file:
+            entry_file.write(TITLE_LENGTH.pack(len(title_bytes)))
+            entry_file.write(title_bytes)
+            entry_file.write(encode_tree(node))
+        os.replace(tmp_path, path)
+
+    def prune(self, max_bytes: int) -> int:
+        """Remove least recently used entries, and old versions, beyond max_bytes
+
+        Returns the number of files removed.
+        """
+        removed = 0
+        entries: list[tuple[int, int, str]] = []
+        version = os.path.basename(self.entries_path)
+        for root, _, files in os.walk(self.path):
+            current = os.path.relpath(root, self.path).split(os.sep)[0] == version
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                if not current:
+                    os.remove(path)
+                    removed += 1
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
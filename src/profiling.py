@@ -0,0 +1,138 @@
+"""
+profiling module
+"""
+
+import json
+import time
+
+STAGES = ("read", "parse", "inline", "serialize", "template", "write")
+
+# PageStats of the page being generated in this process, or None when
+# profiling is off. Hot paths check it before taking any timings.
+ACTIVE = None
+
+
+class PageStats:
+    """
+    PageStats Class
+
+    Wall time and call count per stage for one page.
+    """
+
+    __slots__ = ("page", "stages")
+
+    def __init__(self, page: str):
+        self.page = page
+        self.stages: dict[str, list] = {}
+
+    def add(self, stage: str, seconds: float, calls: int = 1):
+        """Record time spent in a stage"""
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def seconds(self, stage: str) -> float:
+        entry = self.stages.get(stage)
+        return entry[0] if entry is not None else 0.0
+
+    def total(self) -> float:
+        return sum(entry[0] for entry in self.stages.values())
+
+    def timer(self, stage: str) -> "StageTimer":
+        return StageTimer(self, stage)
+
+
+class StageTimer:
+    """
+    StageTimer Class: context manager adding its wall time to a PageStats
+    """
+
+    __slots__ = ("page_stats", "stage", "start")
+
+    def __init__(self, page_stats: PageStats, stage: str):
+        self.page_stats = page_stats
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.page_stats.add(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class BuildStats:
+    """
+    BuildStats Class
+
+    Aggregates PageStats from every page of a build.
+    """
+
+    def __init__(self):
+        self.pages: list[PageStats] = []
+        self.start = time.perf_counter()
+        self.wall_seconds = 0.0
+
+    def add_page(self, page_stats: PageStats):
+        self.pages.append(page_stats)
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self.start
+
+    def totals(self) -> dict[str, dict]:
+        """Summed seconds and calls per stage over all pages"""
+        totals: dict[str, dict] = {}
+        for page_stats in self.pages:
+            for stage, (seconds, calls) in page_stats.stages.items():
+                entry = totals.setdefault(stage, {"seconds": 0.0, "calls": 0})
+                entry["seconds"] += seconds
+                entry["calls"] += calls
+        return {stage: totals[stage] for stage in STAGES if stage in totals}
+
+    def slowest(self, count: int = 10) -> list[PageStats]:
+        return sorted(self.pages, key=PageStats.total, reverse=True)[:count]
+
+    def to_dict(self, slowest: int = 10) -> dict:
+        return {
+            "pages": len(self.pages),
+            "wall_seconds": self.wall_seconds,
+            "stages": self.totals(),
+            "slowest": [
+                {
+                    "page": page_stats.page,
+                    "seconds": page_stats.total(),
+                    "stages": {
+                        stage: {"seconds": seconds, "calls": calls}
+                        for stage, (seconds, calls) in page_stats.stages.items()
+                    },
+                }
+                for page_stats in self.slowest(slowest)
+            ],
+        }
+
+    def write_json(self, path: str, slowest: int = 10):
+        with open(path, "w") as stats_file:
+            json.dump(self.to_dict(slowest), stats_file, indent=1)
+
+    def report(self, slowest: int = 10) -> str:
+        """Human readable totals and slowest pages"""
+        lines = [f"Built {len(self.pages)} pages in {self.wall_seconds:.3f}s"]
+        totals = self.totals()
+        stage_sum = sum(entry["seconds"] for entry in totals.values()) or 1.0
+        for stage, entry in totals.items():
+            lines.append(
+                f"  {stage:10} {entry['seconds']:9.4f}s {entry['calls']:9d} calls"
+                f" {100 * entry['seconds'] / stage_sum:5.1f}%"
+            )
+        lines.append("Slowest pages:")
+        for page_stats in self.slowest(slowest):
+            worst = max(page_stats.stages, key=page_stats.seconds, default="-")
+            lines.append(
+                f"  {page_stats.total():9.4f}s  {page_stats.page} (mostly {worst})"
+            )
+        return "\n".join(lines)
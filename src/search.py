@@ -0,0 +1,170 @@
+"""
+search module
+
+Client-side search index built from the markdown blocks the page
+generator already streams, instead of crawling the finished HTML.
+"""
+
+import json
+import os
+import posixpath
+import re
+
+SEARCH_DIR_NAME = "search"
+SEARCH_INDEX_VERSION = 1
+TITLE_BOOST = 10
+HEADING_BOOSTS = {1: 5, 2: 3}
+SUBHEADING_BOOST = 2
+MIN_TERM_LENGTH = 2
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or"
+    " that the this to was were which with".split()
+)
+TERM_PATTERN = re.compile(r"[^\W_]+")
+HEADING_PATTERN = re.compile(r"(#{1,6}) ")
+LINK_TARGET_PATTERN = re.compile(r"\]\([^)]*\)")
+
+
+def add_terms(text: str, weight: int, terms: dict[str, int]):
+    """Add weight to every term of a piece of markdown
+
+    Markup characters are not word characters, so only link and image
+    targets need removing; their text and alt text are kept.
+    """
+    if "](" in text:
+        text = LINK_TARGET_PATTERN.sub("]", text)
+    for term in TERM_PATTERN.findall(text.lower()):
+        if len(term) >= MIN_TERM_LENGTH and term not in STOP_WORDS:
+            terms[term] = terms.get(term, 0) + weight
+
+
+def block_weight(block: str) -> int:
+    """Weight of a block's terms: headings count more, by level"""
+    match = HEADING_PATTERN.match(block)
+    if match is None:
+        return 1
+    return HEADING_BOOSTS.get(len(match.group(1)), SUBHEADING_BOOST)
+
+
+class PageTerms:
+    """
+    PageTerms Class
+
+    Weighted terms of one page, filled block by block while the page is
+    generated and sent back from worker processes.
+    """
+
+    __slots__ = ("title", "terms")
+
+    def __init__(self, title: str | None = None, terms: dict[str, int] | None = None):
+        self.title = title
+        self.terms = terms if terms is not None else {}
+
+    def add_block(self, block: str):
+        add_terms(block, block_weight(block), self.terms)
+
+    def collect(self, blocks):
+        """Pass blocks through, adding the terms of each"""
+        for block in blocks:
+            self.add_block(block)
+            yield block
+
+    def set_title(self, title: str):
+        self.title = title
+        add_terms(title, TITLE_BOOST, self.terms)
+
+    def to_dict(self) -> dict:
+        return {"title": self.title, "terms": self.terms}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PageTerms":
+        return cls(data["title"], data["terms"])
+
+
+def page_url(basepath: str, page_key: str) -> str:
+    """URL of an output-relative page path: blog/tom/index.html -> /blog/tom/"""
+    if posixpath.basename(page_key) == "index.html":
+        page_key = posixpath.dirname(page_key)
+        if page_key:
+            page_key += "/"
+    return basepath + page_key
+
+
+def shard_name(term: str) -> str:
+    """Shard a term is stored in: its first character, or "_" outside a-z0-9"""
+    first = term[0]
+    return first if "a" <= first <= "z" or "0" <= first <= "9" else "_"
+
+
+class SearchIndex:
+    """
+    SearchIndex Class
+
+    Terms of every generated page, keyed by the page's path relative to
+    the output directory, written as an inverted index split into one
+    JSON shard per leading character so the browser only fetches the
+    shards of the terms it looks up.
+    """
+
+    def __init__(self, dest_dir_path: str = "", basepath: str = "/"):
+        self.dest_dir_path = dest_dir_path
+        self.basepath = basepath
+        self.pages: dict[str, PageTerms] = {}
+
+    def page_key(self, dest_path: str) -> str:
+        if self.dest_dir_path:
+            dest_path = os.path.relpath(dest_path, self.dest_dir_path)
+        return dest_path.replace(os.sep, "/")
+
+    def add(self, dest_path: str, page: PageTerms):
+        self.pages[self.page_key(dest_path)] = page
+
+    def shards(self) -> tuple[list[list[str]], dict[str, dict[str, list[list[int]]]]]:
+        """The page table and {shard: {term: [[page id, score], ...]}}
+
+        Postings are ordered by descending score, then page id.
+        """
+        table: list[list[str]] = []
+        postings: dict[str, list[list[int]]] = {}
+        for page_id, page_key in enumerate(sorted(self.pages)):
+            page = self.pages[page_key]
+            table.append([page_url(self.basepath, page_key), page.title or ""])
+            for term, score in page.terms.items():
+                postings.setdefault(term, []).append([page_id, score])
+        shards: dict[str, dict[str, list[list[int]]]] = {}
+        for term in sorted(postings):
+            hits = postings[term]
+            hits.sort(key=lambda hit: (-hit[1], hit[0]))
+            shards.setdefault(shard_name(term), {})[term] = hits
+        return table, shards
+
+    def write(self, dir_path: str) -> list[str]:
+        """Write index.json and the term shards into dir_path
+
+        Shards left over from an earlier build are removed. Returns the
+        shard names written.
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        table, shards = self.shards()
+        for name in sorted(shards):
+            _write_json(os.path.join(dir_path, f"{name}.json"), shards[name])
+        _write_json(
+            os.path.join(dir_path, "index.json"),
+            {
+                "version": SEARCH_INDEX_VERSION,
+                "pages": table,
+                "shards": sorted(shards),
+            },
+        )
+        for file_name in os.listdir(dir_path):
+            name, ext = os.path.splitext(file_name)
+            if ext == ".json" and name != "index" and name not in shards:
+                os.remove(os.path.join(dir_path, file_name))
+        return sorted(shards)
+
+
+def _write_json(path: str, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as index_file:
+        json.dump(data, index_file, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,126 @@
+"""
+serve module
+
+Development server: builds the site incrementally, serves the output
+directory and, with --watch, rebuilds whatever changed on every save.
+"""
+
+import argparse
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from build import generate_pages_incremental
+from utils import sync_static_to_dir
+
+WATCHED_PATHS = ("content", "static", "template.html")
+STATIC_PREFIX = "static" + os.sep
+
+
+def snapshot(paths) -> dict[str, tuple[int, int]]:
+    """Map every file under paths to its (mtime_ns, size)"""
+    state: dict[str, tuple[int, int]] = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for root, _, files in os.walk(path):
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                state[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(old: dict, new: dict) -> list[str]:
+    """Paths added, removed or modified between two snapshots"""
+    changed = [path for path, state in new.items() if old.get(path) != state]
+    changed.extend(path for path in old if path not in new)
+    return sorted(changed)
+
+
+def rebuild(output_dir: str, basepath: str, jobs: int, changed=None) -> list[str]:
+    """Bring output_dir up to date; only changed pages are re-rendered
+
+    A template or basepath change re-renders every page on jobs workers.
+    """
+    if changed is None or any(path.startswith(STATIC_PREFIX) for path in changed):
+        sync_static_to_dir(output_dir)
+    if changed is not None and all(path.startswith(STATIC_PREFIX) for path in changed):
+        return []
+    return generate_pages_incremental(
+        "content", "template.html", output_dir, basepath, jobs=jobs
+    )
+
+
+def watch(on_change, paths=WATCHED_PATHS, interval: float = 0.2, stop: threading.Event | None = None):
+    """Poll paths and call on_change with the changed files until stop is set"""
+    stop = stop or threading.Event()
+    state = snapshot(paths)
+    while not stop.wait(interval):
+        new_state = snapshot(paths)
+        changed = changed_paths(state, new_state)
+        state = new_state
+        if changed:
+            on_change(changed)
+
+
+def serve(output_dir: str, port: int) -> ThreadingHTTPServer:
+    """Serve output_dir from a background thread"""
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=output_dir)
+    server = ThreadingHTTPServer(("", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build and serve the site")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--output", default="docs", help="directory to build into and serve")
+    parser.add_argument("--watch", action="store_true", help="rebuild on every change")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=0,
+        metavar="N",
+        help="worker processes for full re-renders (0 = one per CPU)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rebuild(args.output, args.basepath, args.jobs)
+    server = serve(args.output, args.port)
+    print(f"Serving '{args.output}' at http://localhost:{args.port}{args.basepath}")
+
+    def on_change(changed):
+        start = time.perf_counter()
+        try:
+            rebuilt = rebuild(args.output, args.basepath, args.jobs, changed)
+        except Exception as err:
+            print(f"Rebuild failed: {err}")
+            return
+        print(f"Rebuilt {len(rebuilt)} pages in {time.perf_counter() - start:.3f}s")
+
+    try:
+        if args.watch:
+            watch(on_change)
+        else:
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+template module
+"""
+
+import os
+import re
+
+from htmlnode import escape_html
+from links import find_refs
+
+TEMPLATE_NAME = "template.html"
+TITLE_SLOT = "Title"
+CONTENT_SLOT = "Content"
+SLOT_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+ROOT_PATH_PREFIXES = ('href="/', 'src="/')
+ROOT_PATH_CHARS = frozenset("".join(ROOT_PATH_PREFIXES))
+ROOT_PATH_PATTERN = re.compile(r'(href|src)="/([^"]*)')
+
+
+def normalize_basepath(basepath: str) -> str:
+    """Ensure a basepath has a leading and a trailing slash"""
+    if not basepath.startswith("/"):
+        basepath = "/" + basepath
+    if not basepath.endswith("/"):
+        basepath = basepath + "/"
+    return basepath
+
+
+class Template:
+    """
+    Template Class
+
+    A page template split once into literal segments and placeholder
+    slots. Literal segments already carry the basepath rewrite, so a
+    page renders with a single join. With assets (a map of static paths
+    to fingerprinted names), root-relative references to those files are
+    renamed in the same pass.
+    """
+
+    def __init__(self, text: str, basepath: str = "/", assets: dict[str, str] | None = None):
+        self.basepath = normalize_basepath(basepath)
+        self.assets = assets or {}
+        # references in the template itself, before the basepath rewrite
+        self.refs = find_refs(SLOT_PATTERN.sub("", text))
+        self.segments: list[str] = []
+        self.slots: list[tuple[int, str]] = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(text):
+            self.segments.append(self.rewrite_paths(text[position : match.start()]))
+            self.slots.append((len(self.segments), match.group(1)))
+            self.segments.append("")
+            position = match.end()
+        self.segments.append(self.rewrite_paths(text[position:]))
+
+    @classmethod
+    def from_file(
+        cls, template_path: str, basepath: str = "/", assets: dict[str, str] | None = None
+    ) -> "Template":
+        """Read and compile a template file"""
+        with open(template_path, "r") as template_file:
+            return cls(template_file.read(), basepath, assets)
+
+    def rewrite_paths(self, text: str) -> str:
+        """Prefix absolute href and src paths with the basepath"""
+        if self.assets:
+            return ROOT_PATH_PATTERN.sub(self._rewrite_match, text)
+        if self.basepath == "/":
+            return text
+        text = text.replace('href="/', f'href="{self.basepath}')
+        return text.replace('src="/', f'src="{self.basepath}')
+
+    def _rewrite_match(self, match) -> str:
+        path = match.group(2)
+        return f'{match.group(1)}="{self.basepath}{self.assets.get(path, path)}'
+
+    def rewrite_chunks(self, chunks):
+        """Rewrite a stream of chunks as if it were one string
+
+        A chunk tail that could start an href/src prefix is held back
+        until the next chunk shows whether it completes one. With assets,
+        text is only cut where the whole-string scan of rewrite_paths
+        would resume, and a reference still open at the end of a chunk
+        is held back whole, so the result matches rewriting the joined
+        string.
+        """
+        if self.basepath == "/" and not self.assets:
+            yield from chunks
+            return
+        pending = ""
+        for chunk in chunks:
+            text = pending + chunk
+            cut = len(text) - _partial_prefix_length(text)
+            if self.assets:
+                last = None
+                for last in ROOT_PATH_PATTERN.finditer(text):
+                    pass
+                if last is not None:
+                    # the asset path runs up to the closing quote
+                    cut = last.start() if last.end() == len(text) else max(cut, last.end())
+            pending = text[cut:]
+            text = text[:cut]
+            if text:
+                yield self.rewrite_paths(text)
+        if pending:
+            yield self.rewrite_paths(pending)
+
+    def write(self, fp, title: str, content_chunks):
+        """Stream the page into a text file object, escaping the title"""
+        slot_names = dict(self.slots)
+        if list(slot_names.values()).count(CONTENT_SLOT) > 1:
+            content_chunks = ["".join(content_chunks)]
+        title = self.rewrite_paths(escape_html(title))
+        for index, segment in enumerate(self.segments):
+            name = slot_names.get(index)
+            if name == TITLE_SLOT:
+                fp.write(title)
+            elif name == CONTENT_SLOT:
+                fp.writelines(self.rewrite_chunks(content_chunks))
+            else:
+                fp.write(segment)
+
+    def render(self, title: str, content: str) -> str:
+        """Fill the slots, escaping the title, and return the page"""
+        values = {
+            TITLE_SLOT: self.rewrite_paths(escape_html(title)),
+            CONTENT_SLOT: self.rewrite_paths(content),
+        }
+        segments = self.segments.copy()
+        for index, name in self.slots:
+            segments[index] = values[name]
+        return "".join(segments)
+
+
+class TemplateResolver:
+    """
+    TemplateResolver Class
+
+    Finds each page's template: the nearest template.html in the page's
+    directory or a parent up to content_dir, else root_path. Answers are
+    cached per directory and every template is compiled once, so after
+    the first page of a directory a lookup is a dict hit. overrides maps
+    source paths to the template named in their front matter, relative
+    to root_path's directory, which wins over the lookup.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        content_dir: str | None = None,
+        basepath: str = "/",
+        assets: dict[str, str] | None = None,
+        overrides: dict[str, str] | None = None,
+    ):
+        self.root_path = root_path
+        self.content_dir = os.path.normpath(content_dir) if content_dir is not None else None
+        self.basepath = basepath
+        self.assets = assets
+        self.overrides = overrides or {}
+        self.paths: dict[str, str] = {}
+        self.templates: dict[str, Template] = {}
+
+    def path_for(self, src_path: str) -> str:
+        """Path of the template a content file renders with"""
+        if self.overrides:
+            name = self.overrides.get(src_path)
+            if name is not None:
+                return os.path.join(os.path.dirname(self.root_path), name)
+        if self.content_dir is None:
+            return self.root_path
+        directory = os.path.dirname(src_path)
+        path = self.paths.get(directory)
+        if path is None:
+            path = self.paths[directory] = self._find(os.path.normpath(directory))
+        return path
+
+    def _find(self, directory: str) -> str:
+        missed: list[str] = []
+        path = self.root_path
+        while True:
+            cached = self.paths.get(directory)
+            if cached is not None:
+                path = cached
+                break
+            missed.append(directory)
+            candidate = os.path.join(directory, TEMPLATE_NAME)
+            if os.path.isfile(candidate):
+                path = candidate
+                break
+            parent = os.path.dirname(directory)
+            if directory == self.content_dir or parent == directory:
+                break
+            directory = parent
+        for directory in missed:
+            self.paths[directory] = path
+        return path
+
+    def get(self, path: str) -> Template:
+        """The compiled template at path"""
+        template = self.templates.get(path)
+        if template is None:
+            template = self.templates[path] = Template.from_file(
+                path, self.basepath, self.assets
+            )
+        return template
+
+    def resolve(self, src_path: str) -> tuple[str, Template]:
+        """(path, compiled template) a content file renders with"""
+        path = self.path_for(src_path)
+        return path, self.get(path)
+
+
+def _partial_prefix_length(text: str) -> int:
+    """Length of the longest tail of text that is a proper prefix of an href/src prefix"""
+    if not text or text[-1] not in ROOT_PATH_CHARS:
+        return 0
+    longest = 0
+    for prefix in ROOT_PATH_PREFIXES:
+        for length in range(len(prefix) - 1, longest, -1):
+            if text.endswith(prefix[:length]):
+                longest = length
+                break
+    return longest
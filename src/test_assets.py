@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+
+from assets import ASSET_MANIFEST_NAME, fingerprint_static, fingerprinted_name
+from fixtures import write_bytes
+from manifest import hash_bytes
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        os.makedirs(self.dest)
+        write_bytes(os.path.join(self.static, "index.css"), b"body {}")
+        write_bytes(os.path.join(self.static, "images/a.png"), b"png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprinted_name(self):
+        self.assertEqual(fingerprinted_name("index.css", "0123abcdef"), "index.0123abcd.css")
+        self.assertEqual(fingerprinted_name("a/b", "0123abcdef"), "a/b.0123abcd")
+
+    def test_fingerprint_static(self):
+        assets = fingerprint_static(self.static, self.dest)
+        css = fingerprinted_name("index.css", hash_bytes(b"body {}"))
+        self.assertEqual(assets["index.css"], css)
+        self.assertEqual(set(assets), {"index.css", "images/a.png"})
+        with open(os.path.join(self.dest, css), "rb") as f:
+            self.assertEqual(f.read(), b"body {}")
+        with open(os.path.join(self.dest, ASSET_MANIFEST_NAME)) as f:
+            self.assertEqual(json.load(f)["assets"], assets)
+
+    def test_changed_file_replaces_old_fingerprint(self):
+        old = fingerprint_static(self.static, self.dest)["index.css"]
+        write_bytes(os.path.join(self.static, "index.css"), b"body { margin: 0 }")
+        new = fingerprint_static(self.static, self.dest)["index.css"]
+        self.assertNotEqual(old, new)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, old)))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, new)))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "images")))
+
+    def test_removed_file_is_dropped(self):
+        old = fingerprint_static(self.static, self.dest)["images/a.png"]
+        os.remove(os.path.join(self.static, "images/a.png"))
+        self.assertEqual(list(fingerprint_static(self.static, self.dest)), ["index.css"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, old)))
+
+
+if __name__ == "__main__":
+    unittest.main()
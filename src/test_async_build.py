@@ -0,0 +1,71 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from async_build import generate_pages_async
+from block_cache import BlockCache
+from build import generate_pages
+from fixtures import read_file, write_file
+from links import LinkIndex
+from template import TemplateResolver
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css"><article>{{ Content }}</article>'
+
+
+class TestAsyncBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.template_path = os.path.join(root, "template.html")
+        write_file(self.template_path, TEMPLATE)
+        self.pages = []
+        for i in range(12):
+            src = os.path.join(root, "content", f"p{i}", "index.md")
+            write_file(src, f"# Page {i}\n\n[next](/p{i + 1}) and **shared**")
+            self.pages.append((src, os.path.join(f"p{i}", "index.html")))
+
+    def build(self, dest, **kwargs):
+        pages = [(src, os.path.join(dest, rel)) for src, rel in self.pages]
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(pages, self.template_path, "/site", **kwargs)
+        return pages
+
+    def test_matches_serial_build(self):
+        serial_dest = os.path.join(self.tmp.name, "serial")
+        async_dest = os.path.join(self.tmp.name, "async")
+        serial_cache, async_cache = BlockCache(), BlockCache()
+        serial_links, async_links = LinkIndex(serial_dest), LinkIndex(async_dest)
+        self.build(serial_dest, cache=serial_cache, links=serial_links)
+        pages = self.build(async_dest, io_workers=3, cache=async_cache, links=async_links)
+        for _, dest in pages:
+            rel = os.path.relpath(dest, async_dest)
+            self.assertEqual(read_file(dest), read_file(os.path.join(serial_dest, rel)))
+        self.assertEqual(list(async_cache.entries), list(serial_cache.entries))
+        self.assertEqual(async_links.pages, serial_links.pages)
+
+    def test_first_failing_page_in_input_order_is_reported(self):
+        for i in (4, 9):
+            write_file(self.pages[i][0], "no title here")
+        dest = os.path.join(self.tmp.name, "docs")
+        pages = [(src, os.path.join(dest, rel)) for src, rel in self.pages]
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaisesRegex(RuntimeError, r"p4/index\.md"):
+                generate_pages_async(pages, TemplateResolver(self.template_path), 2)
+        self.assertTrue(os.path.exists(pages[3][1]))
+        self.assertFalse(os.path.exists(pages[9][1]))
+
+    def test_write_failure_is_reported(self):
+        dest = os.path.join(self.tmp.name, "docs")
+        pages = [(src, os.path.join(dest, rel)) for src, rel in self.pages]
+        # a directory where the page should go makes the write fail
+        os.makedirs(pages[2][1])
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaisesRegex(RuntimeError, r"p2/index\.md"):
+                generate_pages_async(pages, TemplateResolver(self.template_path), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+
+from benchmark import compare, generate_corpus, run_benchmark
+from utils import extract_title, markdown_to_html_node
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generate_corpus_is_deterministic_and_parses(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            paths = generate_corpus(first, posts=3, huge=1, links=1, lists=1, seed=7)
+            other = generate_corpus(second, posts=3, huge=1, links=1, lists=1, seed=7)
+            self.assertEqual(len(paths), 6)
+            for path, other_path in zip(paths, other):
+                with open(path) as page_file, open(other_path) as other_file:
+                    markdown = page_file.read()
+                    self.assertEqual(markdown, other_file.read())
+                extract_title(markdown)
+                markdown_to_html_node(markdown).to_html()
+
+    def test_run_benchmark_reports_every_stage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out_dir = os.path.join(tmp, "out")
+            os.makedirs(out_dir)
+            paths = generate_corpus(os.path.join(tmp, "content"), 2, 0, 1, 1)
+            results = run_benchmark(paths, "{{ Title }}{{ Content }}", out_dir, repeat=1)
+        self.assertEqual(results["pages"], 4)
+        self.assertEqual(
+            set(results["stages"]),
+            {
+                "read",
+                "markdown_to_blocks",
+                "block_to_block_type",
+                "text_to_textnodes",
+                "markdown_to_html_node",
+                "to_html",
+                "template",
+                "write",
+            },
+        )
+        self.assertTrue(compare(results, results))
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+
+from block_cache import BlockCache, block_key
+from utils import markdown_to_html_node
+
+MARKDOWN = """# Title
+
+A **bold** paragraph
+
+- a list
+- of _items_
+
+```
+code
+```
+"""
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = BlockCache(track_added=True)
+        self.assertIsNone(cache.get("block"))
+        cache.put("block", "<p>block</p>")
+        self.assertEqual(cache.get("block"), "<p>block</p>")
+        self.assertEqual(cache.drain_added(), {block_key("block"): "<p>block</p>"})
+        self.assertEqual(cache.drain_added(), {})
+
+    def test_evicts_least_recently_used(self):
+        cache = BlockCache(max_bytes=10)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+        cache.put("c", "cccc")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "aaaa")
+        self.assertEqual(cache.get("c"), "cccc")
+        self.assertEqual(cache.size, 8)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "blocks.json")
+            cache = BlockCache(path)
+            cache.put("a", "<p>a</p>")
+            cache.save()
+            self.assertEqual(BlockCache.load(path).get("a"), "<p>a</p>")
+            with open(path, "w") as cache_file:
+                json.dump({"version": -1, "entries": [[block_key("a"), "old"]]}, cache_file)
+            self.assertIsNone(BlockCache.load(path).get("a"))
+
+    def test_markdown_to_html_node_with_cache(self):
+        want = markdown_to_html_node(MARKDOWN).to_html()
+        cache = BlockCache()
+        self.assertEqual(markdown_to_html_node(MARKDOWN, cache).to_html(), want)
+        self.assertEqual(len(cache.entries), 4)
+        self.assertEqual(markdown_to_html_node(MARKDOWN, cache).to_html(), want)
+        self.assertEqual(len(cache.entries), 4)
+
+    def test_cached_fragments_are_not_escaped_again(self):
+        markdown = "a < b & c\n\n[x](/q?a=1&b=2)"
+        want = markdown_to_html_node(markdown).to_html()
+        self.assertIn("a &lt; b &amp; c", want)
+        cache = BlockCache()
+        markdown_to_html_node(markdown, cache)
+        self.assertEqual(len(cache.entries), 2)
+        self.assertEqual(markdown_to_html_node(markdown, cache).to_html(), want)
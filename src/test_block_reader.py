@@ -0,0 +1,55 @@
+import io
+import random
+import unittest
+
+from block_reader import MarkdownBlockReader
+from utils import extract_title, iter_blocks_html, markdown_to_blocks, markdown_to_html_node
+
+
+def read_blocks(markdown: str, chunk_size: int) -> tuple[list[str], str | None]:
+    reader = MarkdownBlockReader(io.StringIO(markdown), chunk_size)
+    return list(reader), reader.title
+
+
+class TestMarkdownBlockReader(unittest.TestCase):
+    def test_matches_markdown_to_blocks(self):
+        md = """
+# Title
+
+This is **bolded** paragraph
+
+- This is a list
+- with items
+
+
+
+```
+code
+```
+"""
+        for chunk_size in (1, 2, 3, 7, 1024):
+            blocks, title = read_blocks(md, chunk_size)
+            self.assertEqual(blocks, markdown_to_blocks(md))
+            self.assertEqual(title, "Title")
+
+    def test_matches_markdown_to_blocks_random(self):
+        rng = random.Random(3)
+        pieces = ["a", "b ", "\n", "\n\n", "# t", "#x", "  "]
+        for _ in range(300):
+            md = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            try:
+                want_title = extract_title(md)
+            except ValueError:
+                want_title = None
+            for chunk_size in (1, 2, 5):
+                self.assertEqual(read_blocks(md, chunk_size), (markdown_to_blocks(md), want_title), repr(md))
+
+    def test_no_title(self):
+        self.assertEqual(read_blocks("just text\n\nmore", 4), (["just text", "more"], None))
+
+    def test_iter_blocks_html_matches_tree(self):
+        md = "# Title\n\nSome _text_\n\n> quote\n\n1. one\n2. two"
+        blocks, _ = read_blocks(md, 5)
+        self.assertEqual(
+            "".join(iter_blocks_html(blocks)), markdown_to_html_node(md).to_html()
+        )
@@ -0,0 +1,335 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from build import collect_pages, generate_pages, generate_pages_incremental
+from fixtures import read_file, write_file
+from frontmatter import read_front_matter_file
+from manifest import BuildManifest
+from profiling import BuildStats
+from block_cache import BlockCache
+from links import LinkIndex
+from search import SearchIndex
+from utils import iter_content_pages
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css"><article>{{ Content }}</article>'
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        self.dest = os.path.join(root, "docs")
+        write_file(self.template, TEMPLATE)
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        write_file(os.path.join(self.content, "blog", "a", "index.md"), "# A\n\nPost a")
+        write_file(os.path.join(self.content, "blog", "b", "index.md"), "# B\n\nPost b")
+
+    def build(self, basepath: str = "/", assets=None) -> list[str]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuilt = generate_pages_incremental(
+                self.content, self.template, self.dest, basepath, assets=assets
+            )
+        return sorted(os.path.relpath(path, self.content) for path in rebuilt)
+
+    def test_collect_pages(self):
+        pages = collect_pages(self.content, self.dest)
+        self.assertEqual(
+            sorted(os.path.relpath(dest, self.dest) for _, dest in pages),
+            ["blog/a/index.html", "blog/b/index.html", "index.html"],
+        )
+
+    def test_first_build_renders_everything(self):
+        self.assertEqual(
+            self.build(), ["blog/a/index.md", "blog/b/index.md", "index.md"]
+        )
+        manifest = BuildManifest.load(self.dest)
+        self.assertEqual(
+            manifest.pages["blog/a/index.md"]["dest"], "blog/a/index.html"
+        )
+        self.assertEqual(set(manifest.inputs), {"basepath", "renderer", "assets"})
+        self.assertEqual(
+            sorted(manifest.pages["blog/a/index.md"]["deps"]),
+            ["source:blog/a/index.md", f"template:{self.template}"],
+        )
+
+    def test_unchanged_build_renders_nothing(self):
+        self.build()
+        manifest_path = os.path.join(self.dest, ".build-manifest.json")
+        os.utime(manifest_path, ns=(0, 0))
+        self.assertEqual(self.build(), [])
+        self.assertEqual(os.stat(manifest_path).st_mtime_ns, 0)
+        self.assertNotIn("\n", read_file(manifest_path))
+
+    def test_changed_source_renders_one_page(self):
+        self.build()
+        write_file(os.path.join(self.content, "blog", "a", "index.md"), "# A2\n\nEdited")
+        self.assertEqual(self.build(), ["blog/a/index.md"])
+        self.assertIn(
+            "<title>A2</title>",
+            read_file(os.path.join(self.dest, "blog", "a", "index.html")),
+        )
+
+    def test_template_or_basepath_change_renders_everything(self):
+        self.build()
+        write_file(self.template, TEMPLATE + "\n")
+        self.assertEqual(len(self.build()), 3)
+        self.assertEqual(len(self.build("/site/")), 3)
+        self.assertIn(
+            'href="/site/index.css"', read_file(os.path.join(self.dest, "index.html"))
+        )
+
+    def test_section_template_renders_its_subtree(self):
+        blog_template = os.path.join(self.content, "blog", "template.html")
+        write_file(blog_template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(len(self.build()), 3)
+        self.assertEqual(
+            read_file(os.path.join(self.dest, "blog", "a", "index.html")),
+            "<h1>A</h1><div><h1>A</h1><p>Post a</p></div>",
+        )
+        self.assertIn("<title>Home</title>", read_file(os.path.join(self.dest, "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "template.html")))
+        write_file(blog_template, "<h2>{{ Title }}</h2>{{ Content }}")
+        self.assertEqual(self.build(), ["blog/a/index.md", "blog/b/index.md"])
+        write_file(os.path.join(self.content, "blog", "b", "template.html"), "{{ Content }}")
+        self.assertEqual(self.build(), ["blog/b/index.md"])
+        os.remove(blog_template)
+        self.assertEqual(self.build(), ["blog/a/index.md"])
+        self.assertEqual(self.build(), [])
+
+    def test_drafts_are_skipped_and_front_matter_template_used(self):
+        write_file(os.path.join(self.tmp.name, "layouts", "post.html"), "post {{ Content }}")
+        post = os.path.join(self.content, "blog", "a", "index.md")
+        write_file(post, "---\ntitle: Front\ntemplate: layouts/post.html\n---\n# A\n\nx")
+        write_file(os.path.join(self.content, "blog", "b", "index.md"), "---\ndraft: true\n---\n# B")
+        templates: dict[str, str] = {}
+        pages = collect_pages(self.content, self.dest, templates=templates)
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(templates, {post: "layouts/post.html"})
+        self.assertEqual(len(collect_pages(self.content, self.dest, drafts=True)), 3)
+        self.assertEqual(self.build(), ["blog/a/index.md", "index.md"])
+        self.assertEqual(
+            read_file(os.path.join(self.dest, "blog", "a", "index.html")),
+            "post <div><h1>A</h1><p>x</p></div>",
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "b")))
+        write_file(os.path.join(self.tmp.name, "layouts", "post.html"), "new {{ Content }}")
+        self.assertEqual(self.build(), ["blog/a/index.md"])
+
+    def test_front_matter_is_read_only_for_changed_sources(self):
+        write_file(os.path.join(self.content, "blog", "b", "index.md"), "---\ndraft: true\n---\n# B")
+        self.build()
+        post = os.path.join(self.content, "blog", "a", "index.md")
+        write_file(post, "# A2\n\nEdited")
+        with mock.patch("build.read_front_matter_file", wraps=read_front_matter_file) as read:
+            self.assertEqual(self.build(), ["blog/a/index.md"])
+        self.assertEqual([call.args for call in read.call_args_list], [(post,)])
+        self.assertTrue(BuildManifest.load(self.dest).pages["blog/b/index.md"]["draft"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "b")))
+
+    def test_front_matter_title_replaces_heading(self):
+        write_file(
+            os.path.join(self.content, "index.md"), "---\ntitle: Q&A\n---\n# Home\n\nWelcome"
+        )
+        serial_dest = os.path.join(self.tmp.name, "serial")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(collect_pages(self.content, serial_dest), self.template)
+            generate_pages(collect_pages(self.content, self.dest), self.template, io_workers=2)
+        for dest in (serial_dest, self.dest):
+            self.assertEqual(
+                read_file(os.path.join(dest, "index.html")),
+                '<title>Q&amp;A</title><link href="/index.css"><article>'
+                "<div><h1>Home</h1><p>Welcome</p></div></article>",
+            )
+
+    def test_changed_asset_renders_only_pages_referencing_it(self):
+        write_file(os.path.join(self.content, "blog", "a", "index.md"), "# A\n\n![x](/x.png)")
+        assets = {"index.css": "index.1.css", "x.png": "x.1.png"}
+        self.assertEqual(len(self.build(assets=assets)), 3)
+        self.assertEqual(self.build(assets=assets), [])
+        self.assertEqual(
+            self.build(assets=assets | {"x.png": "x.2.png"}), ["blog/a/index.md"]
+        )
+        self.assertIn('src="/x.2.png"', read_file(os.path.join(self.dest, "blog", "a", "index.html")))
+        self.assertEqual(
+            len(self.build(assets={"index.css": "index.2.css", "x.png": "x.2.png"})), 3
+        )
+        self.assertEqual(len(self.build()), 3)
+
+    def test_turning_fingerprinting_on_renders_everything(self):
+        self.assertEqual(len(self.build()), 3)
+        self.assertEqual(len(self.build(assets={"index.css": "index.1.css"})), 3)
+        self.assertIn(
+            'href="/index.1.css"', read_file(os.path.join(self.dest, "index.html"))
+        )
+        self.assertEqual(self.build(assets={"index.css": "index.1.css"}), [])
+
+    def test_removed_linked_page_renders_pages_linking_to_it(self):
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\n[b](/blog/b)")
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "b", "index.md"))
+        os.rmdir(os.path.join(self.content, "blog", "b"))
+        self.assertEqual(self.build(), ["index.md"])
+
+    def test_deleted_source_removes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "b", "index.md"))
+        os.rmdir(os.path.join(self.content, "blog", "b"))
+        self.assertEqual(self.build(), [])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "b")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "blog", "a", "index.html")))
+
+    def test_missing_output_is_regenerated(self):
+        self.build()
+        os.remove(os.path.join(self.dest, "index.html"))
+        self.assertEqual(self.build(), ["index.md"])
+
+    def test_parallel_build_matches_serial(self):
+        serial_dest = os.path.join(self.tmp.name, "serial")
+        parallel_dest = os.path.join(self.tmp.name, "parallel")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(collect_pages(self.content, serial_dest), self.template)
+            generate_pages(
+                collect_pages(self.content, parallel_dest), self.template, jobs=3
+            )
+        for _, dest in collect_pages(self.content, serial_dest):
+            rel = os.path.relpath(dest, serial_dest)
+            self.assertEqual(
+                read_file(dest), read_file(os.path.join(parallel_dest, rel))
+            )
+
+    def test_parallel_build_uses_section_templates(self):
+        write_file(os.path.join(self.content, "blog", "template.html"), "{{ Content }}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(
+                collect_pages(self.content, self.dest),
+                self.template,
+                jobs=2,
+                content_dir=self.content,
+            )
+        self.assertEqual(
+            read_file(os.path.join(self.dest, "blog", "b", "index.html")),
+            "<div><h1>B</h1><p>Post b</p></div>",
+        )
+        self.assertIn("<title>Home</title>", read_file(os.path.join(self.dest, "index.html")))
+
+    def test_memory_budget_build_matches_serial(self):
+        serial_dest = os.path.join(self.tmp.name, "serial")
+        budget_dest = os.path.join(self.tmp.name, "budget")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(collect_pages(self.content, serial_dest), self.template)
+            generate_pages(
+                iter_content_pages(self.content, budget_dest),
+                self.template,
+                jobs=2,
+                memory_budget=1,
+            )
+        for _, dest in collect_pages(self.content, serial_dest):
+            rel = os.path.relpath(dest, serial_dest)
+            self.assertEqual(
+                read_file(dest), read_file(os.path.join(budget_dest, rel))
+            )
+
+    def test_parallel_build_reports_failing_page(self):
+        bad = os.path.join(self.content, "blog", "b", "index.md")
+        write_file(bad, "no title here")
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaisesRegex(RuntimeError, "blog/b/index.md"):
+                generate_pages(collect_pages(self.content, self.dest), self.template, jobs=2)
+
+    def test_generate_pages_collects_stats(self):
+        stats = BuildStats()
+        serial_dest = os.path.join(self.tmp.name, "serial")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(collect_pages(self.content, self.dest), self.template, stats=stats)
+            generate_pages(collect_pages(self.content, serial_dest), self.template)
+        self.assertEqual(len(stats.pages), 3)
+        self.assertEqual(
+            set(stats.totals()), {"read", "parse", "inline", "serialize", "template", "write"}
+        )
+        for _, dest in collect_pages(self.content, serial_dest):
+            rel = os.path.relpath(dest, serial_dest)
+            self.assertEqual(read_file(dest), read_file(os.path.join(self.dest, rel)))
+
+    def test_parallel_build_merges_block_cache(self):
+        cache = BlockCache()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(
+                collect_pages(self.content, self.dest), self.template, jobs=2, cache=cache
+            )
+        self.assertEqual(cache.get("Post a"), "<p>Post a</p>")
+        self.assertEqual(len(cache.entries), 6)
+
+    def test_serial_build_keeps_block_cache_within_cap(self):
+        for i in range(20):
+            write_file(os.path.join(self.content, f"p{i}.md"), f"# P{i}\n\n" + f"text {i} " * 20)
+        cache = BlockCache(max_bytes=1000)
+        for io_workers in (0, 2):
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages(
+                    collect_pages(self.content, self.dest),
+                    self.template,
+                    cache=cache,
+                    io_workers=io_workers,
+                )
+            self.assertLessEqual(cache.size, 1000)
+            self.assertEqual(cache.added, {})
+
+    def test_parallel_build_matches_serial_search_index(self):
+        serial, parallel = SearchIndex(self.dest), SearchIndex(self.dest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(collect_pages(self.content, self.dest), self.template, search=serial)
+            generate_pages(
+                collect_pages(self.content, self.dest), self.template, jobs=2, search=parallel
+            )
+        self.assertEqual(serial.shards(), parallel.shards())
+        self.assertEqual(serial.pages["blog/a/index.html"].terms, {"post": 1})
+
+    def test_incremental_build_keeps_search_terms_of_unchanged_pages(self):
+        self.build()
+        write_file(os.path.join(self.content, "blog", "a", "index.md"), "# A\n\nRewritten")
+        search = SearchIndex(self.dest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuilt = generate_pages_incremental(
+                self.content, self.template, self.dest, search=search
+            )
+        self.assertEqual(len(rebuilt), 3)
+        self.assertEqual(search.pages["blog/a/index.html"].terms, {"rewritten": 1})
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\nHello")
+        search = SearchIndex(self.dest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuilt = generate_pages_incremental(
+                self.content, self.template, self.dest, search=search
+            )
+        self.assertEqual(len(rebuilt), 1)
+        self.assertEqual(search.pages["blog/a/index.html"].terms, {"rewritten": 1})
+        self.assertEqual(search.pages["index.html"].title, "Home")
+        self.assertEqual(search.pages["index.html"].terms, {"home": 15, "hello": 1})
+
+    def test_incremental_build_keeps_links_of_unchanged_pages(self):
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\n[a](/blog/a) [x](/nope)")
+        self.build()
+        write_file(os.path.join(self.content, "blog", "a", "index.md"), "# A\n\n[home](/)")
+        links = LinkIndex(self.dest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuilt = generate_pages_incremental(
+                self.content, self.template, self.dest, links=links
+            )
+        self.assertEqual(len(rebuilt), 1)
+        self.assertEqual(links.pages["index.html"], ["/index.css", "/blog/a", "/nope"])
+        self.assertEqual(links.pages["blog/a/index.html"], ["/index.css", "/"])
+        self.assertEqual(
+            links.broken(set(links.pages)),
+            [
+                ("blog/a/index.html", "/index.css"),
+                ("blog/b/index.html", "/index.css"),
+                ("index.html", "/index.css"),
+                ("index.html", "/nope"),
+            ],
+        )
@@ -0,0 +1,53 @@
+import contextlib
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+from compress import COMPRESS_MANIFEST_NAME, precompress_dir
+from fixtures import write_bytes
+
+BODY = b"<p>" + b"compressible " * 200 + b"</p>"
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = self.tmp.name
+        write_bytes(os.path.join(self.dest, "index.html"), BODY)
+        write_bytes(os.path.join(self.dest, "blog/index.html"), BODY)
+        write_bytes(os.path.join(self.dest, "small.css"), b"p {}")
+        write_bytes(os.path.join(self.dest, "image.png"), BODY)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_gzip_siblings_above_threshold(self):
+        compressed = precompress_dir(self.dest, jobs=2)
+        self.assertEqual(compressed, ["index.html", "blog/index.html"])
+        with gzip.open(os.path.join(self.dest, "blog/index.html.gz")) as f:
+            self.assertEqual(f.read(), BODY)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "small.css.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "image.png.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, COMPRESS_MANIFEST_NAME + ".gz")))
+
+    def test_only_changed_content_is_recompressed(self):
+        precompress_dir(self.dest)
+        write_bytes(os.path.join(self.dest, "index.html"), BODY)
+        self.assertEqual(precompress_dir(self.dest), [])
+        write_bytes(os.path.join(self.dest, "index.html"), BODY + b"<p>more</p>")
+        self.assertEqual(precompress_dir(self.dest), ["index.html"])
+        os.remove(os.path.join(self.dest, "blog/index.html.gz"))
+        self.assertEqual(precompress_dir(self.dest), ["blog/index.html"])
+
+    def test_siblings_of_removed_files_are_removed(self):
+        precompress_dir(self.dest)
+        os.remove(os.path.join(self.dest, "index.html"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            precompress_dir(self.dest)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.html.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from dependencies import DependencyGraph, page_inputs, page_target
+
+PAGES = {"index.html", "blog/tom/index.html", "about.html"}
+
+
+class TestDependencies(unittest.TestCase):
+    def test_page_target(self):
+        self.assertEqual(page_target("", PAGES), "index.html")
+        self.assertEqual(page_target("blog/tom", PAGES), "blog/tom/index.html")
+        self.assertEqual(page_target("about", PAGES), "about.html")
+        self.assertIsNone(page_target("nope", PAGES))
+
+    def test_page_inputs(self):
+        inputs = page_inputs(
+            "blog/tom/index.html",
+            ["/index.css", "/", "../../about", "/images/tom.png", "https://x.dev", "/nope", "#top"],
+            {"basepath": "b"},
+            {"index.css": "index.1234abcd.css", "images/tom.png": "images/tom.5678abcd.png"},
+            PAGES,
+        )
+        self.assertEqual(
+            inputs,
+            {
+                "basepath": "b",
+                "asset:index.css": "index.1234abcd.css",
+                "asset:images/tom.png": "images/tom.5678abcd.png",
+                "page:index.html": "1",
+                "page:about.html": "1",
+            },
+        )
+
+    def test_assets_are_ignored_without_an_asset_map(self):
+        self.assertEqual(page_inputs("index.html", ["/index.css"], {}, None, PAGES), {})
+
+    def test_invalidated(self):
+        graph = DependencyGraph()
+        graph.add("a.md", {"template:t": "1", "source:a.md": "a", "asset:x.png": "x1"})
+        graph.add("b.md", {"template:t": "1", "source:b.md": "b", "page:a.html": "1"})
+        current = {"template:t": "1", "source:a.md": "a", "source:b.md": "b", "asset:x.png": "x1", "page:a.html": "1"}
+        self.assertEqual(graph.invalidated(current), {})
+        self.assertEqual(
+            graph.invalidated(current | {"asset:x.png": "x2"}), {"a.md": ["asset:x.png"]}
+        )
+        self.assertEqual(
+            graph.invalidated(current | {"template:t": "2", "source:b.md": "c"}),
+            {"a.md": ["template:t"], "b.md": ["source:b.md", "template:t"]},
+        )
+        del current["page:a.html"]
+        self.assertEqual(graph.invalidated(current), {"b.md": ["page:a.html"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+from frontmatter import (
+    FrontMatter,
+    parse_front_matter,
+    read_front_matter,
+    read_front_matter_file,
+    split_front_matter,
+)
+
+PAGE = """---
+title: "Tom: a mistake?"
+date: 2024-01-31
+draft: yes
+template: layouts/post.html
+# a comment
+tags: [tolkien, 'opinion']
+---
+# Heading
+
+Body
+"""
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_split_front_matter(self):
+        front_matter, body = split_front_matter(PAGE)
+        self.assertEqual(
+            front_matter,
+            FrontMatter(
+                "Tom: a mistake?",
+                datetime.date(2024, 1, 31),
+                True,
+                "layouts/post.html",
+                ["tolkien", "opinion"],
+            ),
+        )
+        self.assertEqual(body, "# Heading\n\nBody\n")
+
+    def test_without_front_matter(self):
+        for markdown in ("# Title\n\n---\n", "---\ntitle: never closed\n\n# Title"):
+            front_matter, body = split_front_matter(markdown)
+            self.assertEqual(front_matter, FrontMatter())
+            self.assertEqual(body, markdown)
+
+    def test_reader_stops_after_front_matter(self):
+        fp = io.StringIO(PAGE)
+        self.assertEqual(read_front_matter(fp).title, "Tom: a mistake?")
+        self.assertEqual(fp.readline(), "# Heading\n")
+        fp = io.StringIO("# Title\n")
+        self.assertEqual(read_front_matter(fp), FrontMatter())
+        self.assertEqual(fp.read(), "# Title\n")
+
+    def test_block_list_and_unknown_keys(self):
+        front_matter = parse_front_matter(["tags:\n", "  - a\n", "  - b c\n", "author: me\n"])
+        self.assertEqual(front_matter.tags, ["a", "b c"])
+        self.assertEqual(parse_front_matter(["tags: solo"]).tags, ["solo"])
+
+    def test_quoted_bool_and_datetime(self):
+        front_matter = parse_front_matter(['draft: "false"', "date: 2024-01-31T10:00:00Z"])
+        self.assertFalse(front_matter.draft)
+        self.assertEqual(front_matter.date, datetime.date(2024, 1, 31))
+
+    def test_errors_name_the_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "post.md")
+            with open(path, "w") as file:
+                file.write("---\ndate: someday\n---\n# Post")
+            with self.assertRaisesRegex(ValueError, r"post\.md.*ISO date"):
+                read_front_matter_file(path)
+
+    def test_invalid_values(self):
+        for lines in (["draft: maybe"], ["date: yesterday"], ["no colon here"]):
+            with self.assertRaises(ValueError):
+                parse_front_matter(lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,23 @@ test leafnode
 
 import unittest
 
+from fixtures import bytes_per_instance
+from htmlnode import SafeString
 from leafnode import LeafNode
 
 
+class DictLeafNode:
+    """
+    LeafNode layout before __slots__, used as the memory baseline
+    """
+
+    def __init__(self, tag=None, value=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
+
+
 class TestLeafNode(unittest.TestCase):
     """
     TestLeafNode
@@ -25,3 +39,59 @@ class TestLeafNode(unittest.TestCase):
         want = '<a href="https://www.google.com">Click me!</a>'
         got = leaf_node.to_html()
         self.assertEqual(want, got, "Expected a valid tag")
+
+    def test_to_html_escapes_text(self):
+        self.assertEqual(
+            LeafNode("p", '< Back & "forth" >').to_html(),
+            '<p>&lt; Back &amp; "forth" &gt;</p>',
+        )
+        self.assertEqual(LeafNode(None, "a<b").to_html(), "a&lt;b")
+
+    def test_to_html_escapes_props(self):
+        leaf_node = LeafNode("img", "", {"src": "/a?x=1&y=2", "alt": 'say "hi" <3'})
+        self.assertEqual(
+            leaf_node.to_html(),
+            '<img src="/a?x=1&amp;y=2" alt="say &quot;hi&quot; &lt;3"></img>',
+        )
+
+    def test_non_string_values_render_as_str(self):
+        self.assertEqual(LeafNode("p", 5).to_html(), "<p>5</p>")
+        self.assertEqual(
+            LeafNode("a", "x", {"class": ["a", "b"]}).to_html(),
+            "<a class=\"['a', 'b']\">x</a>",
+        )
+        self.assertEqual(LeafNode("a", "x", {"n": 1}).to_html(), '<a n="1">x</a>')
+        self.assertEqual(LeafNode("a", "x", {"n": True}).to_html(), '<a n="True">x</a>')
+        self.assertEqual(
+            LeafNode("a", "x", {"href": SafeString("/a&amp;b")}).to_html(),
+            '<a href="/a&amp;b">x</a>',
+        )
+        self.assertEqual(
+            LeafNode("a", "x", {"href": "/a&amp;b"}).to_html(),
+            '<a href="/a&amp;amp;b">x</a>',
+        )
+
+    def test_safe_string_is_not_escaped(self):
+        html = SafeString("<p>cached &amp; done</p>")
+        self.assertEqual(LeafNode(None, html).to_html(), html)
+        self.assertEqual(LeafNode("div", html).to_html(), f"<div>{html}</div>")
+
+    def test_plain_text_is_returned_unchanged(self):
+        text = "nothing to escape here"
+        self.assertIs(LeafNode(None, text).to_html(), text)
+
+    def test_repr(self):
+        leaf_node = LeafNode("a", "x", {"href": "/"})
+        self.assertEqual(repr(leaf_node), "LeafNode(a, x, {'href': '/'})")
+
+    def test_slots_save_memory(self):
+        leaf_node = LeafNode("b", "bold")
+        self.assertFalse(hasattr(leaf_node, "__dict__"))
+        self.assertIsNone(leaf_node.children)
+        slotted = bytes_per_instance(lambda i: LeafNode("b", "bold"))
+        baseline = bytes_per_instance(lambda i: DictLeafNode("b", "bold"))
+        self.assertLess(
+            slotted,
+            baseline,
+            f"LeafNode: {slotted:.0f} bytes/node, dict-based: {baseline:.0f} bytes/node",
+        )
@@ -0,0 +1,38 @@
+import unittest
+
+from links import LinkIndex, collect_refs, find_refs, resolve_ref
+
+
+class TestLinks(unittest.TestCase):
+    def test_find_refs(self):
+        html = '<a href="/blog">x</a><img src="a.png" alt="a"></img><p>text</p>'
+        self.assertEqual(find_refs(html), ["/blog", "a.png"])
+        self.assertEqual(find_refs("plain"), [])
+
+    def test_collect_refs_passes_chunks_through(self):
+        refs = []
+        chunks = list(collect_refs(["<div>", '<a href="/x">x</a>', "</div>"], refs))
+        self.assertEqual(chunks, ["<div>", '<a href="/x">x</a>', "</div>"])
+        self.assertEqual(refs, ["/x"])
+
+    def test_resolve_ref(self):
+        page = "blog/tom/index.html"
+        self.assertIsNone(resolve_ref(page, "https://www.boot.dev"))
+        self.assertIsNone(resolve_ref(page, "mailto:a@b.c"))
+        self.assertIsNone(resolve_ref(page, "//cdn.example.com/x.js"))
+        self.assertIsNone(resolve_ref(page, "#top"))
+        self.assertEqual(resolve_ref(page, "/"), "")
+        self.assertEqual(resolve_ref(page, "/images/tom.png?v=1#x"), "images/tom.png")
+        self.assertEqual(resolve_ref(page, "../majesty/"), "blog/majesty")
+        self.assertEqual(resolve_ref(page, "pic.png"), "blog/tom/pic.png")
+        self.assertEqual(resolve_ref("index.html", "../../x"), "../../x")
+
+    def test_broken(self):
+        index = LinkIndex("docs")
+        index.add("docs/index.html", ["/index.css", "/blog/tom", "/blog/missing", "/"])
+        index.add("docs/blog/tom/index.html", ["/", "../gone.html", "https://x.y", "/images/tom.png"])
+        known = {"index.html", "blog/tom/index.html", "index.css", "images/tom.png"}
+        self.assertEqual(
+            index.broken(known),
+            [("blog/tom/index.html", "../gone.html"), ("index.html", "/blog/missing")],
+        )
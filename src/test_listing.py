@@ -0,0 +1,150 @@
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+from fixtures import read_file, write_file
+from links import LinkIndex
+from listing import (
+    collect_listings,
+    generate_listings,
+    listing_page_key,
+    listing_title,
+    render_listing,
+    sort_entries,
+)
+from utils import read_page_meta
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css">{{ Content }}'
+
+
+class TestListing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        self.dest = os.path.join(root, "docs")
+        write_file(self.template, TEMPLATE)
+        write_file(os.path.join(self.content, "index.md"), "# Home")
+        write_file(os.path.join(self.content, "blog", "tom", "index.md"), "# Tom & co\n\nx")
+        write_file(os.path.join(self.content, "blog", "arwen.md"), "intro\n\n# Arwen")
+        write_file(os.path.join(self.content, "blog", "2024", "jan.md"), "# January")
+        write_file(os.path.join(self.content, "contact", "index.md"), "# Contact")
+
+    def generate(self, **kwargs) -> list[str]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            written = generate_listings(self.content, self.template, self.dest, **kwargs)
+        return sorted(os.path.relpath(path, self.dest) for path in written)
+
+    def test_read_page_meta_stops_at_title(self):
+        path = os.path.join(self.tmp.name, "big.md")
+        write_file(path, "# Big\n\n" + "body\n" * 100000)
+        # an undecodable tail would fail a full read
+        with open(path, "ab") as file:
+            file.write(b"\xff")
+        self.assertEqual(read_page_meta(path).title, "Big")
+        meta = read_page_meta(os.path.join(self.content, "blog", "arwen.md"))
+        self.assertEqual(meta.title, "Arwen")
+        write_file(path, "---\ntitle: Set\n---\n# Heading")
+        self.assertEqual(read_page_meta(path).title, "Set")
+        write_file(path, "no title")
+        with self.assertRaises(ValueError):
+            read_page_meta(path)
+
+    def test_collect_listings(self):
+        listings = collect_listings(self.content, self.dest)
+        self.assertEqual(sorted(listings), ["blog", "blog/2024"])
+        self.assertEqual(
+            sorted(listings["blog"]),
+            [
+                ("2024", "blog/2024/index.html", None),
+                ("Arwen", "blog/arwen.html", None),
+                ("Tom & co", "blog/tom/index.html", None),
+            ],
+        )
+        self.assertEqual(listings["blog/2024"], [("January", "blog/2024/jan.html", None)])
+
+    def test_collect_listings_reads_front_matter_and_skips_drafts(self):
+        write_file(
+            os.path.join(self.content, "blog", "arwen.md"),
+            "---\ntitle: Evenstar\ndate: 2024-02-01\n---\n# Arwen",
+        )
+        write_file(os.path.join(self.content, "blog", "2024", "jan.md"), "---\ndraft: true\n---\n# J")
+        listings = collect_listings(self.content, self.dest)
+        self.assertEqual(
+            sorted(listings["blog"]),
+            [
+                ("Evenstar", "blog/arwen.html", datetime.date(2024, 2, 1)),
+                ("Tom & co", "blog/tom/index.html", None),
+            ],
+        )
+        self.assertIn("blog/2024", collect_listings(self.content, self.dest, drafts=True))
+
+    def test_listing_names(self):
+        self.assertEqual(listing_title("blog/fan-fiction"), "Fan Fiction")
+        self.assertEqual(listing_title(""), "Home")
+        self.assertEqual(listing_page_key("blog", 1), "blog/index.html")
+        self.assertEqual(listing_page_key("blog", 3), "blog/page/3/index.html")
+        self.assertEqual(listing_page_key("", 2), "page/2/index.html")
+
+    def test_sort_entries(self):
+        entries = [
+            ("b", "x/2.html", datetime.date(2024, 1, 2)),
+            ("A", "x/3.html", None),
+            ("c", "x/1.html", datetime.date(2024, 3, 1)),
+        ]
+        sort_entries(entries)
+        self.assertEqual([entry[0] for entry in entries], ["A", "b", "c"])
+        sort_entries(entries, "path", reverse=True)
+        self.assertEqual([entry[1] for entry in entries], ["x/3.html", "x/2.html", "x/1.html"])
+        sort_entries(entries, "date", reverse=True)
+        self.assertEqual([entry[0] for entry in entries], ["c", "b", "A"])
+        with self.assertRaises(ValueError):
+            sort_entries(entries, "size")
+
+    def test_render_listing_escapes_and_links_neighbours(self):
+        html = render_listing("blog", [("Q&A", "blog/qa.html", datetime.date(2024, 5, 4))], 2, 3)
+        self.assertEqual(
+            html,
+            '<div class="listing"><ul><li><a href="/blog/qa.html">Q&amp;A</a>'
+            '<time datetime="2024-05-04">2024-05-04</time></li></ul>'
+            '<nav><a href="/blog/" rel="prev">Previous</a><span>Page 2 of 3</span>'
+            '<a href="/blog/page/3/" rel="next">Next</a></nav></div>',
+        )
+
+    def test_generate_listings_paginates(self):
+        links = LinkIndex(self.dest)
+        written = self.generate(basepath="/site", page_size=2, links=links)
+        self.assertEqual(
+            written,
+            ["blog/2024/index.html", "blog/index.html", "blog/page/2/index.html"],
+        )
+        first = read_file(os.path.join(self.dest, "blog", "index.html"))
+        self.assertIn("<title>Blog</title>", first)
+        self.assertIn('href="/site/blog/2024/">2024</a>', first)
+        self.assertIn('href="/site/blog/arwen.html">Arwen</a>', first)
+        self.assertIn('href="/site/blog/page/2/" rel="next"', first)
+        second = read_file(os.path.join(self.dest, "blog", "page", "2", "index.html"))
+        self.assertIn("<title>Blog (page 2)</title>", second)
+        self.assertIn('href="/site/blog/tom/">Tom &amp; co</a>', second)
+        self.assertEqual(
+            links.pages["blog/page/2/index.html"],
+            ["/index.css", "/blog/tom/", "/blog/"],
+        )
+        self.assertEqual(self.generate(page_size=0), ["blog/2024/index.html", "blog/index.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "page")))
+
+    def test_generate_listings_uses_section_template(self):
+        write_file(os.path.join(self.content, "blog", "template.html"), "blog {{ Content }}")
+        self.generate(sort="path", reverse=True)
+        self.assertTrue(
+            read_file(os.path.join(self.dest, "blog", "2024", "index.html")).startswith("blog ")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import pickle
+import unittest
+
+from htmlnode import SafeString
+from leafnode import LeafNode
+from node_codec import decode_text_nodes, decode_tree, encode_text_nodes, encode_tree
+from parentnode import ParentNode
+from textnode import TextNode, TextType
+from utils import markdown_to_html_node, text_to_textnodes
+
+MARKDOWN = """# Title
+
+Some **bold** and _italic_ text with a [link](/blog?a=1&b=2) and ![img](/a.png)
+
+> a quote
+
+- one
+- two
+
+```
+code <here>
+```"""
+
+
+class TestNodeCodec(unittest.TestCase):
+    def test_tree_round_trip(self):
+        tree = markdown_to_html_node(MARKDOWN * 3)
+        decoded = decode_tree(encode_tree(tree))
+        self.assertEqual(decoded.to_html(), tree.to_html())
+        self.assertIsInstance(decoded, ParentNode)
+
+    def test_leaf_fields_round_trip(self):
+        tree = ParentNode(
+            "div",
+            [
+                LeafNode(None, "plain"),
+                LeafNode(None, SafeString("<p>cached</p>")),
+                LeafNode("img", "", {"src": "/a.png", "alt": ""}),
+                ParentNode("p", [ParentNode("b", [LeafNode(None, "deep")])], {"class": "x"}),
+                LeafNode("i", "last"),
+            ],
+        )
+        decoded = decode_tree(encode_tree(tree))
+        self.assertEqual(decoded.to_html(), tree.to_html())
+        leaves = decoded.children
+        self.assertIsNone(leaves[0].tag)
+        self.assertNotIsInstance(leaves[0].value, SafeString)
+        self.assertIsInstance(leaves[1].value, SafeString)
+        self.assertEqual(leaves[2].props, {"src": "/a.png", "alt": ""})
+        self.assertEqual(leaves[3].props, {"class": "x"})
+        self.assertIsNone(leaves[4].props)
+
+    def test_text_nodes_round_trip(self):
+        nodes = text_to_textnodes("a **b** _c_ `d` [e](/f) ![g](/h.png)")
+        self.assertEqual(decode_text_nodes(encode_text_nodes(nodes)), nodes)
+        self.assertEqual(
+            decode_text_nodes(encode_text_nodes([TextNode("ü", TextType.TEXT)])),
+            [TextNode("ü", TextType.TEXT)],
+        )
+
+    def test_smaller_than_pickle(self):
+        tree = markdown_to_html_node(MARKDOWN * 20)
+        encoded = encode_tree(tree)
+        pickled = pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+        self.assertLess(
+            len(encoded),
+            len(pickled),
+            f"encoded: {len(encoded)} bytes, pickled: {len(pickled)} bytes",
+        )
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            decode_tree(b"not a tree at all")
+        with self.assertRaises(ValueError):
+            decode_tree(encode_text_nodes([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
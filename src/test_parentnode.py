@@ -2,6 +2,7 @@
 test parentnode
 """
 
+import io
 import unittest
 
 from parentnode import ParentNode
@@ -26,3 +27,39 @@ class TestParentNode(unittest.TestCase):
             parent_node.to_html(),
             "<div><span><b>grandchild</b></span></div>",
         )
+
+    def test_iter_html_streams_chunks(self):
+        parent_node = ParentNode(
+            "div",
+            [ParentNode("p", [LeafNode("b", "x"), LeafNode(None, "y")]), LeafNode("i", "z")],
+        )
+        chunks = list(parent_node.iter_html())
+        self.assertEqual(
+            chunks, ["<div>", "<p>", "<b>x</b>", "y", "</p>", "<i>z</i>", "</div>"]
+        )
+        self.assertEqual(parent_node.to_html(), "".join(chunks))
+
+    def test_write_html(self):
+        parent_node = ParentNode("div", [ParentNode("span", [LeafNode("b", "x")])])
+        buffer = io.StringIO()
+        parent_node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), "<div><span><b>x</b></span></div>")
+
+    def test_to_html_deep_tree(self):
+        node = LeafNode("b", "leaf")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        self.assertTrue(node.to_html().startswith("<span><span>"))
+
+    def test_nested_child_without_children(self):
+        parent_node = ParentNode("div", [ParentNode("p", None)])
+        with self.assertRaises(ValueError):
+            parent_node.to_html()
+
+    def test_slots(self):
+        parent_node = ParentNode("div", [LeafNode("b", "x")])
+        self.assertFalse(hasattr(parent_node, "__dict__"))
+        self.assertIsNone(parent_node.value)
+        self.assertEqual(
+            repr(parent_node), "ParentNode(div, children: [LeafNode(b, x, None)], None)"
+        )
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from parse_cache import ParseCache, parse_key
+from utils import markdown_to_html_node, parse_page
+
+MARKDOWN = "# Title\n\nBody with **bold**"
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = ParseCache(os.path.join(tmp.name, "parsed"))
+
+    def test_put_and_get(self):
+        key = parse_key(MARKDOWN)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "Tïtle", markdown_to_html_node(MARKDOWN))
+        title, node = self.cache.get(key)
+        self.assertEqual(title, "Tïtle")
+        self.assertEqual(node.to_html(), markdown_to_html_node(MARKDOWN).to_html())
+
+    def test_parse_page_uses_cache(self):
+        title, node = parse_page(MARKDOWN, parse_cache=self.cache)
+        self.assertEqual(title, "Title")
+        key = parse_key(MARKDOWN)
+        # a stored entry is served without parsing again
+        self.cache.put(key, "Stored", node)
+        self.assertEqual(parse_page(MARKDOWN, parse_cache=self.cache)[0], "Stored")
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = parse_key(MARKDOWN)
+        self.cache.put(key, "Title", markdown_to_html_node(MARKDOWN))
+        with open(self.cache.entry_path(key), "wb") as entry_file:
+            entry_file.write(b"\x05\x00")
+        self.assertIsNone(self.cache.get(key))
+
+    def test_prune(self):
+        node = markdown_to_html_node(MARKDOWN)
+        for i in range(4):
+            key = parse_key(f"{MARKDOWN} {i}")
+            self.cache.put(key, "Title", node)
+            os.utime(self.cache.entry_path(key), ns=(i, i))
+        old_version = os.path.join(self.cache.path, "v0.0", "ab", "x")
+        os.makedirs(os.path.dirname(old_version))
+        open(old_version, "w").close()
+        size = os.path.getsize(self.cache.entry_path(parse_key(MARKDOWN + " 0")))
+        self.assertEqual(self.cache.prune(2 * size), 3)
+        self.assertFalse(os.path.exists(old_version))
+        self.assertIsNone(self.cache.get(parse_key(MARKDOWN + " 1")))
+        self.assertIsNotNone(self.cache.get(parse_key(MARKDOWN + " 3")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import pickle
+import unittest
+
+import profiling
+from profiling import BuildStats, PageStats
+from utils import text_to_children
+
+
+class TestProfiling(unittest.TestCase):
+    def test_page_stats_accumulates(self):
+        page_stats = PageStats("a.md")
+        page_stats.add("parse", 0.5)
+        page_stats.add("parse", 0.25)
+        with page_stats.timer("write"):
+            pass
+        self.assertEqual(page_stats.stages["parse"], [0.75, 2])
+        self.assertEqual(page_stats.stages["write"][1], 1)
+        copy = pickle.loads(pickle.dumps(page_stats))
+        self.assertEqual(copy.page, "a.md")
+        self.assertEqual(copy.stages["parse"], [0.75, 2])
+
+    def test_build_stats_totals_and_slowest(self):
+        stats = BuildStats()
+        fast = PageStats("fast.md")
+        fast.add("read", 0.1)
+        slow = PageStats("slow.md")
+        slow.add("read", 0.2)
+        slow.add("inline", 1.0, 3)
+        stats.add_page(fast)
+        stats.add_page(slow)
+        stats.finish()
+        totals = stats.totals()
+        self.assertEqual(list(totals), ["read", "inline"])
+        self.assertAlmostEqual(totals["read"]["seconds"], 0.3)
+        self.assertEqual(totals["inline"]["calls"], 3)
+        self.assertEqual([page.page for page in stats.slowest(1)], ["slow.md"])
+        self.assertEqual(stats.to_dict()["slowest"][0]["page"], "slow.md")
+        self.assertIn("slow.md (mostly inline)", stats.report())
+
+    def test_inline_timing_only_when_active(self):
+        text_to_children("plain **bold**")
+        page_stats = PageStats("p.md")
+        profiling.ACTIVE = page_stats
+        try:
+            text_to_children("plain **bold**")
+        finally:
+            profiling.ACTIVE = None
+        self.assertEqual(page_stats.stages["inline"][1], 1)
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import unittest
+
+from search import PageTerms, SearchIndex, add_terms, page_url, shard_name
+
+
+class TestSearch(unittest.TestCase):
+    def test_add_terms_skips_markup_link_targets_and_stop_words(self):
+        terms = {}
+        add_terms("The **Bold** _word_ and [a link](https://example.com/x) `code`", 1, terms)
+        self.assertEqual(terms, {"bold": 1, "word": 1, "link": 1, "code": 1})
+
+    def test_headings_and_title_are_boosted(self):
+        page = PageTerms()
+        for block in ["# Hobbits", "## Shire", "#### Pipes", "Hobbits like the Shire"]:
+            page.add_block(block)
+        page.set_title("Hobbits")
+        self.assertEqual(
+            page.terms,
+            {"hobbits": 5 + 1 + 10, "shire": 3 + 1, "pipes": 2, "like": 1},
+        )
+
+    def test_collect_passes_blocks_through(self):
+        page = PageTerms()
+        self.assertEqual(list(page.collect(["# A title", "text"])), ["# A title", "text"])
+        self.assertEqual(page.terms, {"title": 5, "text": 1})
+
+    def test_page_url(self):
+        self.assertEqual(page_url("/", "index.html"), "/")
+        self.assertEqual(page_url("/site/", "blog/tom/index.html"), "/site/blog/tom/")
+        self.assertEqual(page_url("/", "about.html"), "/about.html")
+
+    def test_shard_name(self):
+        self.assertEqual(shard_name("tolkien"), "t")
+        self.assertEqual(shard_name("555"), "5")
+        self.assertEqual(shard_name("éowyn"), "_")
+
+    def test_write_shards(self):
+        index = SearchIndex("docs", "/")
+        index.add(os.path.join("docs", "b", "index.html"), PageTerms("B", {"ring": 1, "elf": 2}))
+        index.add(os.path.join("docs", "index.html"), PageTerms("Home", {"ring": 3}))
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "z.json"), "w") as stale:
+                stale.write("{}")
+            self.assertEqual(index.write(tmp), ["e", "r"])
+            with open(os.path.join(tmp, "index.json")) as f:
+                meta = json.load(f)
+            with open(os.path.join(tmp, "r.json")) as f:
+                ring = json.load(f)
+            self.assertEqual(sorted(os.listdir(tmp)), ["e.json", "index.json", "r.json"])
+        self.assertEqual(meta["pages"], [["/b/", "B"], ["/", "Home"]])
+        self.assertEqual(meta["shards"], ["e", "r"])
+        self.assertEqual(ring, {"ring": [[1, 3], [0, 1]]})
+
+
+if __name__ == "__main__":
+    unittest.main()
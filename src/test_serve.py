@@ -0,0 +1,54 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from fixtures import write_file
+from serve import changed_paths, snapshot, watch
+
+
+class TestServe(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.page = os.path.join(self.root, "content", "index.md")
+        self.template = os.path.join(self.root, "template.html")
+        for path in (self.page, self.template):
+            write_file(path, "x")
+
+    def test_snapshot_and_changed_paths(self):
+        paths = (os.path.join(self.root, "content"), self.template)
+        before = snapshot(paths)
+        self.assertEqual(set(before), {self.page, self.template})
+        write_file(self.page, "changed")
+        added = os.path.join(self.root, "content", "new.md")
+        write_file(added, "new")
+        os.remove(self.template)
+        self.assertEqual(
+            changed_paths(before, snapshot(paths)),
+            sorted([self.page, added, self.template]),
+        )
+
+    def test_watch_reports_changes(self):
+        stop = threading.Event()
+        seen = []
+
+        def on_change(changed):
+            seen.extend(changed)
+            stop.set()
+
+        thread = threading.Thread(
+            target=watch, args=(on_change, (self.template,), 0.01, stop)
+        )
+        thread.start()
+        try:
+            for _ in range(200):
+                with open(self.template, "a") as file:
+                    file.write("y")
+                if stop.wait(0.02):
+                    break
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(seen, [self.template])
@@ -0,0 +1,152 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from fixtures import write_file
+from template import Template, TemplateResolver, normalize_basepath
+
+TEMPLATE = """<title>{{ Title }}</title>
+<link href="/index.css" rel="stylesheet" />
+<article>{{ Content }}</article>
+<footer>{{ Title }}</footer>"""
+
+
+def render_by_replace(text: str, title: str, content: str, basepath: str) -> str:
+    text = text.replace("{{ Title }}", title).replace("{{ Content }}", content)
+    basepath = normalize_basepath(basepath)
+    text = text.replace('href="/', f'href="{basepath}')
+    return text.replace('src="/', f'src="{basepath}')
+
+
+class TestTemplate(unittest.TestCase):
+    def test_normalize_basepath(self):
+        self.assertEqual(normalize_basepath("/"), "/")
+        self.assertEqual(normalize_basepath("site"), "/site/")
+        self.assertEqual(normalize_basepath("/site"), "/site/")
+
+    def test_render_root_basepath(self):
+        template = Template(TEMPLATE)
+        self.assertEqual(
+            template.render("Hi", "<p>body</p>"),
+            render_by_replace(TEMPLATE, "Hi", "<p>body</p>", "/"),
+        )
+
+    def test_render_matches_replace_passes(self):
+        content = '<a href="/blog">x</a><img src="/a.png" alt="a"></img><a href="https://x.y">y</a>'
+        template = Template(TEMPLATE, "/site/")
+        self.assertEqual(
+            template.render("Hi", content),
+            render_by_replace(TEMPLATE, "Hi", content, "/site/"),
+        )
+
+    def test_template_segments_are_rewritten_once(self):
+        template = Template(TEMPLATE, "/site")
+        self.assertIn('href="/site/index.css"', "".join(template.segments))
+        self.assertEqual([name for _, name in template.slots], ["Title", "Content", "Title"])
+
+    def test_no_slots(self):
+        self.assertEqual(Template("plain").render("t", "c"), "plain")
+
+    def test_write_streams_chunks_like_render(self):
+        content = '<a href="/blog">x</a><img src="/a.png" alt="a"></img>'
+        for basepath in ["/", "/site/"]:
+            template = Template(TEMPLATE, basepath)
+            chunks = [content[i : i + 3] for i in range(0, len(content), 3)]
+            buffer = io.StringIO()
+            template.write(buffer, "Hi", iter(chunks))
+            self.assertEqual(buffer.getvalue(), template.render("Hi", content))
+
+    def test_rewrite_chunks_holds_back_partial_prefix(self):
+        template = Template("", "/site/")
+        chunks = ["<a hr", 'ef="', "/x", '">s', 'rc="/</a>']
+        self.assertEqual(
+            "".join(template.rewrite_chunks(chunks)),
+            template.rewrite_paths("".join(chunks)),
+        )
+
+    def test_rewrite_paths_uses_assets(self):
+        template = Template("", "/site", {"index.css": "index.0123abcd.css"})
+        self.assertEqual(
+            template.rewrite_paths('<link href="/index.css"><img src="/a.png">'),
+            '<link href="/site/index.0123abcd.css"><img src="/site/a.png">',
+        )
+
+    def test_rewrite_chunks_assets_split_inside_path(self):
+        template = Template("", "/", {"images/a.png": "images/a.0123abcd.png"})
+        chunks = ['<img src="/ima', 'ges/a', '.png" alt="a"><a href="/x">x</a>']
+        self.assertEqual(
+            "".join(template.rewrite_chunks(chunks)),
+            '<img src="/images/a.0123abcd.png" alt="a"><a href="/x">x</a>',
+        )
+
+    def test_rewrite_chunks_matches_render_for_random_splits(self):
+        pieces = ['href="/', 'src="/', "a.css", "images/x.png", '"', " ", "x", "h", "=", "/"]
+        assets = {"a.css": "a.1.css", "images/x.png": "images/x.2.png"}
+        rng = random.Random(1)
+        for template in (Template("", "/site", assets), Template("", "/site")):
+            for _ in range(2000):
+                text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+                cuts = sorted(rng.choices(range(len(text) + 1), k=rng.randint(0, 4)))
+                chunks = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+                self.assertEqual(
+                    "".join(template.rewrite_chunks(chunks)),
+                    template.rewrite_paths(text),
+                    chunks,
+                )
+
+    def test_title_is_escaped(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(
+            template.render("Q&A <draft>", "<p>x</p>"),
+            "<title>Q&amp;A &lt;draft&gt;</title><p>x</p>",
+        )
+        out = io.StringIO()
+        template.write(out, "Q&A", ["<p>x</p>"])
+        self.assertEqual(out.getvalue(), "<title>Q&amp;A</title><p>x</p>")
+
+
+class TestTemplateResolver(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "template.html")
+        self.content = os.path.join(self.tmp.name, "content")
+        write_file(self.root, "root {{ Content }}")
+        write_file(os.path.join(self.content, "blog", "template.html"), "blog {{ Content }}")
+        os.makedirs(os.path.join(self.content, "blog", "2024", "jan"))
+        os.makedirs(os.path.join(self.content, "docs"))
+
+    def page(self, *parts: str) -> str:
+        return os.path.join(self.content, *parts, "index.md")
+
+    def test_nearest_template_wins(self):
+        resolver = TemplateResolver(self.root, self.content)
+        blog = os.path.join(self.content, "blog", "template.html")
+        self.assertEqual(resolver.path_for(self.page("blog", "2024", "jan")), blog)
+        self.assertEqual(resolver.path_for(self.page("blog")), blog)
+        self.assertEqual(resolver.path_for(self.page("docs")), self.root)
+        self.assertEqual(resolver.path_for(self.page()), self.root)
+
+    def test_without_content_dir_uses_root(self):
+        resolver = TemplateResolver(self.root)
+        self.assertEqual(resolver.path_for(self.page("blog")), self.root)
+
+    def test_lookups_are_cached_per_directory(self):
+        resolver = TemplateResolver(self.root, self.content)
+        resolver.path_for(self.page("blog", "2024", "jan"))
+        with mock.patch("os.path.isfile") as isfile:
+            resolver.path_for(self.page("blog", "2024", "jan"))
+            resolver.path_for(os.path.join(self.content, "blog", "2024", "jan", "b.md"))
+            resolver.path_for(self.page("blog", "2024"))
+        isfile.assert_not_called()
+
+    def test_templates_are_compiled_once(self):
+        resolver = TemplateResolver(self.root, self.content, "/site")
+        path, template = resolver.resolve(self.page("blog"))
+        self.assertIs(resolver.resolve(self.page("blog", "2024"))[1], template)
+        self.assertEqual(template.render("t", "c"), "blog c")
+        self.assertEqual(template.basepath, "/site/")
+        self.assertIsNot(resolver.resolve(self.page("docs"))[1], template)
@@ -1,8 +1,20 @@
 import unittest
 
+from fixtures import bytes_per_instance
 from textnode import TextNode, TextType, text_node_to_html_node
 
 
+class DictTextNode:
+    """
+    TextNode layout before __slots__, used as the memory baseline
+    """
+
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
 class TestTextNode(unittest.TestCase):
     def test_eq(self):
         node = TextNode("This is a text node", TextType.BOLD)
@@ -50,6 +62,21 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(html_node.value, "This is a link node")
         self.assertEqual(html_node.props_to_html(), ' href="https://www.boot.dev"')
 
+    def test_repr(self):
+        node = TextNode("x", TextType.LINK, "/")
+        self.assertEqual(repr(node), "TextNode(x, link, /)")
+
+    def test_slots_save_memory(self):
+        node = TextNode("text", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        slotted = bytes_per_instance(lambda i: TextNode("text", TextType.TEXT))
+        baseline = bytes_per_instance(lambda i: DictTextNode("text", TextType.TEXT))
+        self.assertLess(
+            slotted,
+            baseline,
+            f"TextNode: {slotted:.0f} bytes/node, dict-based: {baseline:.0f} bytes/node",
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
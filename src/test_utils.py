@@ -1,5 +1,10 @@
+import contextlib
+import io
+import os
+import tempfile
 import unittest
 
+from fixtures import write_file
 from textnode import TextNode, TextType
 from utils import (
     split_nodes_delimiter,
@@ -13,6 +18,10 @@ from utils import (
     BlockType,
     markdown_to_html_node,
     extract_title,
+    copy_fd,
+    sync_files,
+    classify_block,
+    iter_content_pages,
 )
 
 
@@ -220,6 +229,32 @@ class TestUtils(unittest.TestCase):
             new_nodes,
         )
     
+    def test_text_to_textnodes_matches_split_pipeline(self):
+        texts = [
+            "",
+            "plain",
+            "**bold** start and _end_",
+            "`code` and **c_d**",
+            "![a](b)[c](d)",
+            "!![a](b) and [x](y) ![z](w) tail",
+            "[a](b) [a](b) ![a](b) **bold**",
+            "a****b and ``",
+            "**_x_** then _y_",
+        ]
+        for text in texts:
+            nodes = [TextNode(text, TextType.TEXT)]
+            nodes = split_nodes_image(nodes)
+            nodes = split_nodes_link(nodes)
+            nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+            nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+            nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+            self.assertListEqual(nodes, text_to_textnodes(text), text)
+
+    def test_text_to_textnodes_unclosed_delimiter(self):
+        for text in ["**open", "a _b", "[x](y) `c", "![i](j) **b** _"]:
+            with self.assertRaisesRegex(ValueError, "not closed"):
+                text_to_textnodes(text)
+
     def test_markdown_to_blocks(self):
         md = """
 This is **bolded** paragraph
@@ -307,6 +342,27 @@ This is the same paragraph on a new line
         block = "paragraph"
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
 
+    def test_classify_block(self):
+        cases = [
+            ("", BlockType.PARAGRAPH, None),
+            ("#no space", BlockType.PARAGRAPH, None),
+            ("####### seven", BlockType.PARAGRAPH, None),
+            ("### three", BlockType.HEADING, None),
+            ("```\ncode```", BlockType.CODE, None),
+            ("```\nunclosed", BlockType.PARAGRAPH, None),
+            ("> a\n>b", BlockType.QUOTE, ["> a", ">b"]),
+            ("> a\nb", BlockType.PARAGRAPH, ["> a", "b"]),
+            ("-x", BlockType.PARAGRAPH, None),
+            ("- a\n- b", BlockType.UNORDERED_LIST, ["- a", "- b"]),
+            ("- a\n* b", BlockType.PARAGRAPH, ["- a", "* b"]),
+            ("1. a\n2. b", BlockType.ORDERED_LIST, ["1. a", "2. b"]),
+            ("1. a\n3. b", BlockType.PARAGRAPH, ["1. a", "3. b"]),
+            ("10. a", BlockType.PARAGRAPH, None),
+        ]
+        for block, block_type, lines in cases:
+            self.assertEqual(classify_block(block), (block_type, lines), block)
+            self.assertEqual(block_to_block_type(block), block_type, block)
+
     def test_paragraph(self):
         md = """
 This is **bolded** paragraph
@@ -420,3 +476,96 @@ This is a paragraph
         with self.assertRaises(ValueError):
             extract_title(md)
 
+
+class TestContentWalk(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def test_iter_content_pages(self):
+        content = os.path.join(self.root, "content")
+        for rel_path in ("index.md", "blog/a/index.md", "blog/b.md", "blog/template.html"):
+            write_file(os.path.join(content, rel_path), "# T")
+        pages = iter_content_pages(content, "docs")
+        self.assertEqual(
+            sorted(pages),
+            [
+                (os.path.join(content, "blog", "a", "index.md"), "docs/blog/a/index.html"),
+                (os.path.join(content, "blog", "b.md"), "docs/blog/b.html"),
+                (os.path.join(content, "index.md"), "docs/index.html"),
+            ],
+        )
+
+    def test_iter_content_pages_deep_tree(self):
+        depth = 1200
+        content = path = os.path.join(self.root, "c")
+        os.mkdir(path)
+        for _ in range(depth):
+            path = os.path.join(path, "d")
+            os.mkdir(path)
+        # shutil.rmtree recurses too, so unwind the tree by hand
+        self.addCleanup(self.remove_chain, path, content)
+        write_file(os.path.join(path, "index.md"), "# T")
+        pages = list(iter_content_pages(content, "o"))
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(pages[0][1].count("/d"), depth)
+
+    def remove_chain(self, path, stop):
+        os.remove(os.path.join(path, "index.md"))
+        while path != stop:
+            os.rmdir(path)
+            path = os.path.dirname(path)
+
+    def test_iter_content_pages_rejects_other_files(self):
+        write_file(os.path.join(self.root, "notes.txt"), "x")
+        with self.assertRaises(ValueError):
+            list(iter_content_pages(self.root, "docs"))
+
+
+class TestStaticSync(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.src = os.path.join(tmp.name, "static")
+        self.dst = os.path.join(tmp.name, "docs")
+        write_file(os.path.join(self.src, "index.css"), "body {}")
+        write_file(os.path.join(self.src, "images", "a.png"), "png" * 1000)
+        write_file(os.path.join(self.dst, "index.html"), "<p>page</p>")
+
+    def sync(self, link=False):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sync_files(self.src, self.dst, link)
+
+    def test_sync_copies_then_skips_unchanged(self):
+        copied, removed = self.sync()
+        self.assertEqual(copied, ["index.css", os.path.join("images", "a.png")])
+        self.assertEqual(removed, [])
+        with open(os.path.join(self.dst, "images", "a.png")) as file:
+            self.assertEqual(file.read(), "png" * 1000)
+        self.assertEqual(self.sync(), ([], []))
+
+    def test_sync_copies_changed_and_removes_deleted(self):
+        self.sync()
+        write_file(os.path.join(self.src, "index.css"), "body { color: red }")
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        copied, removed = self.sync()
+        self.assertEqual(copied, ["index.css"])
+        self.assertEqual(removed, [os.path.join("images", "a.png")])
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "index.html")))
+
+    def test_sync_hardlinks(self):
+        self.sync(link=True)
+        src_stat = os.stat(os.path.join(self.src, "index.css"))
+        dst_stat = os.stat(os.path.join(self.dst, "index.css"))
+        self.assertEqual(src_stat.st_ino, dst_stat.st_ino)
+        self.assertEqual(self.sync(link=True), ([], []))
+
+    def test_copy_fd(self):
+        src_path = os.path.join(self.src, "images", "a.png")
+        dst_path = os.path.join(self.dst, "copy.png")
+        with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            copy_fd(src.fileno(), dst.fileno(), os.path.getsize(src_path))
+        with open(dst_path) as file:
+            self.assertEqual(file.read(), "png" * 1000)
@@ -24,6 +24,8 @@ class TextNode:
     TextNode Class
     """
 
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text: str, text_type: TextType, url: str | None = None):
         self.text = text
         self.text_type = text_type
@@ -1,9 +1,22 @@
 from textnode import TextType, TextNode, text_node_to_html_node
 from parentnode import ParentNode
 import re
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, SafeString
+from leafnode import LeafNode
+from block_cache import BlockCache
+from block_reader import MarkdownBlockReader
+from frontmatter import FrontMatter, read_front_matter, split_front_matter
+from links import collect_refs, find_refs
+from search import PageTerms
+from parse_cache import ParseCache, parse_key
+from template import TEMPLATE_NAME, Template
 from enum import Enum
+import itertools
+import json
 import os
+import time
+import profiling
+from profiling import PageStats
 
 class BlockType(Enum):
     """
@@ -17,58 +30,219 @@ class BlockType(Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
-def generate_pages_recursive(
-    dir_path_content: str, template_path: str, dest_dir_path: str, basepath: str = "/"
-):
-    """Generate pages recursively from a content directory
+def iter_content_pages(dir_path_content: str, dest_dir_path: str):
+    """Yield (source, destination) pairs for every page under a content directory
+
+    The tree is walked with os.scandir and an explicit stack in the same
+    order a recursive os.listdir walk visits it, so deep trees use no
+    Python recursion. Each directory is read and closed before its
+    entries are visited, so no descriptors are held across levels.
+    Per-directory template.html files are not pages and are skipped.
     """
     if not os.path.exists(dir_path_content):
         raise FileNotFoundError(f"content directory not found: {dir_path_content}")
-    if not os.path.exists(dest_dir_path):
-        os.makedirs(dest_dir_path)
-    for file in os.listdir(dir_path_content):
-        if file.endswith(".md"):
-            generate_page(
-                os.path.join(dir_path_content, file),
-                template_path,
-                os.path.join(dest_dir_path, file.replace(".md", ".html")),
-                basepath,
-            )
-        elif os.path.isdir(os.path.join(dir_path_content, file)):
-            generate_pages_recursive(
-                os.path.join(dir_path_content, file),
-                template_path,
-                os.path.join(dest_dir_path, file),
-                basepath,
-            )
+    stack = [(_scan_dir(dir_path_content), dest_dir_path)]
+    while stack:
+        entries, dest_dir = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+        elif entry.name.endswith(".md"):
+            yield entry.path, os.path.join(dest_dir, entry.name.replace(".md", ".html"))
+        elif entry.name == TEMPLATE_NAME:
+            continue
+        elif entry.is_dir():
+            stack.append((_scan_dir(entry.path), os.path.join(dest_dir, entry.name)))
         else:
-            raise ValueError(f"invalid file: {file}")
+            raise ValueError(f"invalid file: {entry.name}")
+
+def _scan_dir(path: str):
+    with os.scandir(path) as entries:
+        return iter(list(entries))
 
 def generate_page(
-    from_path: str, template_path: str, dest_path: str, basepath: str = "/"
+    from_path: str,
+    template_path: str,
+    dest_path: str,
+    basepath: str = "/",
+    template: Template | None = None,
+    stats: PageStats | None = None,
+    cache: BlockCache | None = None,
+    links: list[str] | None = None,
+    search: PageTerms | None = None,
+    parse_cache: ParseCache | None = None,
 ):
     """Generate a page from a content file and a template file
+
+    Pass a compiled template to avoid re-reading template_path per page.
+    Pass stats to record per-stage timings; the page is then rendered in
+    separate serialize/template/write steps instead of one stream.
+    Pass a block cache to reuse the HTML of blocks rendered before.
+    Pass a links list to have every href/src of the page appended to it.
+    Pass search to have the page's title and weighted terms recorded.
+    Pass a parse cache to load the node tree of an unchanged source
+    instead of parsing it; the source is then read whole to hash it.
+    A title set in the page's front matter replaces its first heading.
     """
     print(f"Generating page from '{from_path}' to '{dest_path}' using template '{template_path}'")
+    if stats is not None:
+        generate_page_profiled(
+            from_path,
+            template_path,
+            dest_path,
+            basepath,
+            template,
+            stats,
+            cache,
+            links,
+            search,
+            parse_cache,
+        )
+        return
+    if template is None:
+        template = Template.from_file(template_path, basepath)
+    if links is not None:
+        links.extend(template.refs)
+    if parse_cache is not None:
+        with open(from_path, "r") as content_file:
+            md_content = content_file.read()
+        title, html_node = parse_page(md_content, cache, parse_cache)
+        if search is not None:
+            add_page_terms(search, title, md_content)
+        chunks = html_node.iter_html()
+        if links is not None:
+            chunks = collect_refs(chunks, links)
+        write_atomic(dest_path, lambda dest_file: template.write(dest_file, title, chunks))
+        return
     with open(from_path, "r") as content_file:
-        md_content = content_file.read()
-    with open(template_path, "r") as template_file:
-        template_content = template_file.read()
-    title = extract_title(md_content)
-    html_content = markdown_to_html_node(md_content).to_html()
-    template_content = template_content.replace("{{ Title }}", title).replace(
-        "{{ Content }}", html_content
-    )
-    # Normalize basepath (ensure leading and trailing slash)
-    if not basepath.startswith("/"):
-        basepath = "/" + basepath
-    if not basepath.endswith("/"):
-        basepath = basepath + "/"
-    # Prefix absolute asset and link paths with basepath
-    template_content = template_content.replace('href="/', f'href="{basepath}')
-    template_content = template_content.replace('src="/', f'src="{basepath}')
-    with open(dest_path, "w") as dest_file:
-        dest_file.write(template_content)
+        reader = MarkdownBlockReader(content_file)
+        reader.title = read_front_matter(content_file).title
+        blocks = iter(reader)
+        # the title is written before the content, so read ahead until it is found
+        head: list[str] = []
+        while reader.title is None:
+            block = next(blocks, None)
+            if block is None:
+                raise ValueError("no title found")
+            head.append(block)
+        blocks = itertools.chain(head, blocks)
+        if search is not None:
+            blocks = search.collect(blocks)
+        chunks = iter_blocks_html(blocks, cache)
+        if links is not None:
+            chunks = collect_refs(chunks, links)
+        write_atomic(
+            dest_path,
+            lambda dest_file: template.write(dest_file, reader.title, chunks),
+        )
+    if search is not None:
+        search.set_title(reader.title)
+
+def generate_page_profiled(
+    from_path: str,
+    template_path: str,
+    dest_path: str,
+    basepath: str,
+    template: Template | None,
+    stats: PageStats,
+    cache: BlockCache | None = None,
+    links: list[str] | None = None,
+    search: PageTerms | None = None,
+    parse_cache: ParseCache | None = None,
+):
+    """generate_page with every stage timed into stats
+
+    parse excludes the time spent in inline tokenizing, which is
+    recorded separately as inline, and includes parse cache lookups.
+    """
+    previous = profiling.ACTIVE
+    profiling.ACTIVE = stats
+    try:
+        with stats.timer("read"):
+            with open(from_path, "r") as content_file:
+                md_content = content_file.read()
+            if template is None:
+                template = Template.from_file(template_path, basepath)
+        inline_before = stats.seconds("inline")
+        start = time.perf_counter()
+        title, html_node = parse_page(md_content, cache, parse_cache)
+        elapsed = time.perf_counter() - start
+        stats.add("parse", elapsed - (stats.seconds("inline") - inline_before))
+        with stats.timer("serialize"):
+            html_content = html_node.to_html()
+        if links is not None:
+            links.extend(template.refs)
+            links.extend(find_refs(html_content))
+        if search is not None:
+            add_page_terms(search, title, md_content)
+        with stats.timer("template"):
+            page = template.render(title, html_content)
+        with stats.timer("write"):
+            write_atomic(dest_path, lambda dest_file: dest_file.write(page))
+    finally:
+        profiling.ACTIVE = previous
+
+def render_page(
+    md_content: str,
+    template: Template,
+    cache: BlockCache | None = None,
+    links: list[str] | None = None,
+    search: PageTerms | None = None,
+    parse_cache: ParseCache | None = None,
+) -> str:
+    """Render a page's markdown into the finished page, in memory"""
+    title, html_node = parse_page(md_content, cache, parse_cache)
+    html_content = html_node.to_html()
+    if links is not None:
+        links.extend(template.refs)
+        links.extend(find_refs(html_content))
+    if search is not None:
+        add_page_terms(search, title, md_content)
+    return template.render(title, html_content)
+
+def parse_page(
+    md_content: str,
+    cache: BlockCache | None = None,
+    parse_cache: ParseCache | None = None,
+) -> tuple[str, HTMLNode]:
+    """Title and node tree of a page, from the parse cache when it has them
+
+    The front matter is not part of the tree; its title, when set,
+    replaces the first heading as the page title.
+    """
+    if parse_cache is not None:
+        key = parse_key(md_content)
+        parsed = parse_cache.get(key)
+        if parsed is not None:
+            return parsed
+    front_matter, body = split_front_matter(md_content)
+    title = front_matter.title if front_matter.title is not None else extract_title(body)
+    html_node = markdown_to_html_node(body, cache)
+    if parse_cache is not None:
+        parse_cache.put(key, title, html_node)
+    return title, html_node
+
+def add_page_terms(search: PageTerms, title: str, md_content: str):
+    """Record the title and block terms of a page held in memory"""
+    _, body = split_front_matter(md_content)
+    for block in markdown_to_blocks(body):
+        search.add_block(block)
+    search.set_title(title)
+
+def write_atomic(dest_path: str, write):
+    """Call write with a temporary file object, then move it over dest_path
+
+    A failure while streaming never leaves a half-written page behind.
+    """
+    tmp_path = dest_path + ".tmp"
+    try:
+        with open(tmp_path, "w") as dest_file:
+            write(dest_file)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def extract_title(markdown: str) -> str:
     """Extract the title from a markdown file
@@ -79,6 +253,23 @@ def extract_title(markdown: str) -> str:
             return line[2:].strip()
     raise ValueError("no title found")
 
+def read_page_meta(path: str) -> FrontMatter:
+    """Front matter of a page file, with its title filled in
+
+    Without a title in the front matter, the body is read only as far as
+    its first "# " line, the title extract_title would find.
+    """
+    with open(path, "r") as md_file:
+        front_matter = read_front_matter(md_file)
+        if front_matter.title is None:
+            for line in md_file:
+                if line.startswith("# "):
+                    front_matter.title = line[2:].strip()
+                    break
+            else:
+                raise ValueError("no title found")
+    return front_matter
+
 def copy_static_to_dir(dest_dir_path: str):
     """Copy static files to a destination folder (clears it first)."""
     if not os.path.exists("./static"):
@@ -111,6 +302,128 @@ def copy_files(src_path: str, dst_path: str, buffer_size: int = 1024 * 1024):
     except OSError:
         pass
 
+STATIC_MANIFEST_NAME = ".static-manifest.json"
+
+def sync_static_to_dir(dest_dir_path: str, link: bool = False) -> tuple[list[str], list[str]]:
+    """Sync static files into a destination folder without clearing it."""
+    if not os.path.exists("./static"):
+        raise FileNotFoundError("static folder not found")
+    return sync_files("./static", dest_dir_path, link)
+
+def sync_files(src_path: str, dst_path: str, link: bool = False) -> tuple[list[str], list[str]]:
+    """Make dst_path's copy of src_path's files match src_path
+
+    Files whose size and mtime are unchanged are skipped, and files that
+    an earlier sync copied but that are gone from src_path are removed;
+    anything else in dst_path (generated pages) is left alone. With link,
+    files are hardlinked instead of copied where the filesystem allows.
+    Returns the relative paths copied and removed.
+    """
+    manifest_path = os.path.join(dst_path, STATIC_MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r") as manifest_file:
+            previous = set(json.load(manifest_file))
+    except (OSError, ValueError):
+        previous = set()
+    current: list[str] = []
+    copied: list[str] = []
+    for root, dirs, files in os.walk(src_path):
+        dirs.sort()
+        for name in sorted(files):
+            src_file = os.path.join(root, name)
+            rel_path = os.path.relpath(src_file, src_path)
+            dst_file = os.path.join(dst_path, rel_path)
+            current.append(rel_path)
+            src_stat = os.stat(src_file)
+            try:
+                dst_stat = os.stat(dst_file)
+            except FileNotFoundError:
+                dst_stat = None
+            if (
+                dst_stat is not None
+                and dst_stat.st_size == src_stat.st_size
+                and dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+            ):
+                continue
+            os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+            copy_file(src_file, dst_file, link)
+            copied.append(rel_path)
+    removed = sorted(previous - set(current))
+    for rel_path in removed:
+        remove_output(dst_path, rel_path)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as manifest_file:
+        json.dump(current, manifest_file, indent=1)
+    os.replace(tmp_path, manifest_path)
+    return copied, removed
+
+def copy_file(src_path: str, dst_path: str, link: bool = False):
+    """Copy one file with kernel-side copying, keeping its mode and mtime
+
+    The copy is written next to dst_path and moved over it, so a
+    destination hardlinked to the source is never truncated.
+    """
+    tmp_path = dst_path + ".tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    if link:
+        try:
+            os.link(src_path, tmp_path)
+            os.replace(tmp_path, dst_path)
+            return
+        except OSError:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+    src_stat = os.stat(src_path)
+    with open(src_path, "rb") as src, open(tmp_path, "wb") as dst:
+        copy_fd(src.fileno(), dst.fileno(), src_stat.st_size)
+    os.chmod(tmp_path, src_stat.st_mode & 0o777)
+    os.utime(tmp_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    os.replace(tmp_path, dst_path)
+
+def copy_fd(src_fd: int, dst_fd: int, size: int, buffer_size: int = 1024 * 1024):
+    """Copy size bytes between file descriptors, in the kernel when possible"""
+    offset = 0
+    for kernel_copy in (_copy_file_range, _sendfile):
+        try:
+            while offset < size:
+                sent = kernel_copy(src_fd, dst_fd, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except (AttributeError, OSError):
+            # unsupported here; finish with the next method from where we stopped
+            os.lseek(src_fd, offset, os.SEEK_SET)
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+    while True:
+        chunk = memoryview(os.read(src_fd, buffer_size))
+        if not chunk:
+            break
+        while chunk:
+            chunk = chunk[os.write(dst_fd, chunk) :]
+
+def _copy_file_range(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count)
+
+def _sendfile(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+def remove_output(dest_dir_path: str, rel_path: str):
+    """Remove a generated file and any directories it leaves empty
+    """
+    path = os.path.join(dest_dir_path, rel_path)
+    if os.path.exists(path):
+        print(f"Removing stale output '{path}'")
+        os.remove(path)
+    root = os.path.abspath(dest_dir_path)
+    parent = os.path.dirname(os.path.abspath(path))
+    while parent != root and parent.startswith(root) and os.path.isdir(parent):
+        if os.listdir(parent):
+            break
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
 def empty_dir(path: str):
     """Empty a directory
     """
@@ -134,46 +447,68 @@ def reset_dir(path: str):
         os.rmdir(path)
     os.makedirs(path, exist_ok=True)
 
-def markdown_to_html_node(markdown: str) -> HTMLNode:
+def markdown_to_html_node(markdown: str, cache: BlockCache | None = None) -> HTMLNode:
     blocks = markdown_to_blocks(markdown)
     children: list[HTMLNode] = []
     for block in blocks:
-        html_node = block_to_html_node(block)
-        children.append(html_node)
+        if cache is None:
+            children.append(block_to_html_node(block))
+            continue
+        html = cache.get(block)
+        if html is None:
+            html = block_to_html_node(block).to_html()
+            cache.put(block, html)
+        children.append(LeafNode(None, SafeString(html)))
     return ParentNode("div",children,None)
 
+def iter_blocks_html(blocks, cache: BlockCache | None = None):
+    """
+    Stream the HTML of markdown_to_html_node for an iterable of blocks
+
+    Each block is parsed, serialized and dropped before the next one is
+    read, so memory stays bounded by the largest block.
+    """
+    yield "<div>"
+    for block in blocks:
+        if cache is None:
+            yield from block_to_html_node(block).iter_html()
+            continue
+        html = cache.get(block)
+        if html is None:
+            html = block_to_html_node(block).to_html()
+            cache.put(block, html)
+        yield html
+    yield "</div>"
+
 def block_to_html_node(block: str) -> HTMLNode:
-    block_type = block_to_block_type(block)
-    if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
-    elif block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
-    elif block_type == BlockType.CODE:
-        return code_to_html_node(block)
-    elif block_type == BlockType.ORDERED_LIST:
-        return ordered_list_to_html_node(block)
-    elif block_type == BlockType.UNORDERED_LIST:
-        return unordered_list_to_html_node(block)
-    elif block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
-    else:
+    block_type, lines = classify_block(block)
+    builder = BLOCK_BUILDERS.get(block_type)
+    if builder is None:
         raise ValueError(f"Invalid block type: {block_type}")
+    return builder(block, lines)
 
 def text_to_children(text: str) -> list[HTMLNode]:
-    text_nodes = text_to_textnodes(text)
+    page_stats = profiling.ACTIVE
+    if page_stats is None:
+        text_nodes = text_to_textnodes(text)
+    else:
+        start = time.perf_counter()
+        text_nodes = text_to_textnodes(text)
+        page_stats.add("inline", time.perf_counter() - start)
     children: list[HTMLNode] = []
     for text_node in text_nodes:
         html_node = text_node_to_html_node(text_node)
         children.append(html_node)
     return children
 
-def paragraph_to_html_node(block: str) -> HTMLNode:
-    lines = block.split("\n")
+def paragraph_to_html_node(block: str, lines: list[str] | None = None) -> HTMLNode:
+    if lines is None:
+        lines = block.split("\n")
     paragraph = " ".join(lines)
     children = text_to_children(paragraph)
     return ParentNode("p", children, None)
 
-def heading_to_html_node(block: str) -> HTMLNode:
+def heading_to_html_node(block: str, lines: list[str] | None = None) -> HTMLNode:
     level = 0
     for char in block:
         if char == "#":
@@ -186,7 +521,7 @@ def heading_to_html_node(block: str) -> HTMLNode:
     children = text_to_children(text)
     return ParentNode(f"h{level}", children, None)
 
-def code_to_html_node(block: str) -> HTMLNode:
+def code_to_html_node(block: str, lines: list[str] | None = None) -> HTMLNode:
     if not block.startswith("```") or not block.endswith("```"):
         raise ValueError("invalid code block")
     text = block[4:-3]
@@ -195,8 +530,8 @@ def code_to_html_node(block: str) -> HTMLNode:
     code = ParentNode("code", [child])
     return ParentNode("pre", [code], None)
 
-def ordered_list_to_html_node(block: str) -> HTMLNode:
-    items = block.split("\n")
+def ordered_list_to_html_node(block: str, lines: list[str] | None = None) -> HTMLNode:
+    items = lines if lines is not None else block.split("\n")
     html_items = []
     for item in items:
         text = item[3:]
@@ -204,8 +539,8 @@ def ordered_list_to_html_node(block: str) -> HTMLNode:
         html_items.append(ParentNode("li", children))
     return ParentNode("ol", html_items)
 
-def unordered_list_to_html_node(block: str) -> HTMLNode:
-    items = block.split("\n")
+def unordered_list_to_html_node(block: str, lines: list[str] | None = None) -> HTMLNode:
+    items = lines if lines is not None else block.split("\n")
     html_items = []
     for item in items:
         text = item[2:]
@@ -213,8 +548,9 @@ def unordered_list_to_html_node(block: str) -> HTMLNode:
         html_items.append(ParentNode("li", children))
     return ParentNode("ul", html_items)
 
-def quote_to_html_node(block: str) -> HTMLNode:
-    lines = block.split("\n")
+def quote_to_html_node(block: str, lines: list[str] | None = None) -> HTMLNode:
+    if lines is None:
+        lines = block.split("\n")
     new_lines = []
     for line in lines:
         if not line.startswith(">"):
@@ -224,32 +560,77 @@ def quote_to_html_node(block: str) -> HTMLNode:
     children = text_to_children(content)
     return ParentNode("blockquote", children)
 
+HEADING_PREFIXES = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
+
 def block_to_block_type(block: str) -> BlockType:
     """
     Convert block to block type
     """
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return BlockType.HEADING
+    return classify_block(block)[0]
+
+def classify_block(block: str) -> tuple[BlockType, list[str] | None]:
+    """
+    Classify a block in one scan
+
+    Returns the block type and, when the scan had to split the block
+    into lines, those lines so the node builders can reuse them.
+    """
+    classifier = BLOCK_CLASSIFIERS.get(block[:1])
+    if classifier is None:
+        return BlockType.PARAGRAPH, None
+    return classifier(block)
+
+def _classify_heading(block: str) -> tuple[BlockType, list[str] | None]:
+    if block.startswith(HEADING_PREFIXES):
+        return BlockType.HEADING, None
+    return BlockType.PARAGRAPH, None
+
+def _classify_code(block: str) -> tuple[BlockType, list[str] | None]:
     if block.startswith("```") and block.endswith("```"):
-        return BlockType.CODE
-    if block.startswith(">"):
-        for line in block.split("\n"):
-            if not re.match(r"^>", line):
-                return BlockType.PARAGRAPH
-        return BlockType.QUOTE
-    if block.startswith("- "):
-        for line in block.split("\n"):
-            if not re.match(r"^- ", line):
-                return BlockType.PARAGRAPH
-        return BlockType.UNORDERED_LIST
-    if block.startswith("1. "):
-        i = 1
-        for line in block.split("\n"):
-            if not line.startswith(f"{i}. "):
-                return BlockType.PARAGRAPH
-            i += 1
-        return BlockType.ORDERED_LIST
-    return BlockType.PARAGRAPH
+        return BlockType.CODE, None
+    return BlockType.PARAGRAPH, None
+
+def _classify_quote(block: str) -> tuple[BlockType, list[str] | None]:
+    lines = block.split("\n")
+    for line in lines:
+        if not line.startswith(">"):
+            return BlockType.PARAGRAPH, lines
+    return BlockType.QUOTE, lines
+
+def _classify_unordered_list(block: str) -> tuple[BlockType, list[str] | None]:
+    if not block.startswith("- "):
+        return BlockType.PARAGRAPH, None
+    lines = block.split("\n")
+    for line in lines:
+        if not line.startswith("- "):
+            return BlockType.PARAGRAPH, lines
+    return BlockType.UNORDERED_LIST, lines
+
+def _classify_ordered_list(block: str) -> tuple[BlockType, list[str] | None]:
+    if not block.startswith("1. "):
+        return BlockType.PARAGRAPH, None
+    lines = block.split("\n")
+    for i, line in enumerate(lines, 1):
+        if not line.startswith(f"{i}. "):
+            return BlockType.PARAGRAPH, lines
+    return BlockType.ORDERED_LIST, lines
+
+BLOCK_CLASSIFIERS = {
+    "#": _classify_heading,
+    "`": _classify_code,
+    ">": _classify_quote,
+    "-": _classify_unordered_list,
+    "1": _classify_ordered_list,
+}
+
+BLOCK_BUILDERS = {
+    BlockType.PARAGRAPH: paragraph_to_html_node,
+    BlockType.HEADING: heading_to_html_node,
+    BlockType.CODE: code_to_html_node,
+    BlockType.ORDERED_LIST: ordered_list_to_html_node,
+    BlockType.UNORDERED_LIST: unordered_list_to_html_node,
+    BlockType.QUOTE: quote_to_html_node,
+}
 
 def markdown_to_blocks(markdown: str) -> list[str]:
     """
@@ -264,16 +645,61 @@ def markdown_to_blocks(markdown: str) -> list[str]:
         blocks.append(section)
     return blocks
 
+IMAGE_REGEX = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
+LINK_REGEX = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
+IMAGE_PATTERN = re.compile(IMAGE_REGEX)
+LINK_PATTERN = re.compile(LINK_REGEX)
+INLINE_PATTERN = re.compile(f"{IMAGE_REGEX}|{LINK_REGEX}")
+INLINE_DELIMITERS = (
+    ("**", TextType.BOLD),
+    ("_", TextType.ITALIC),
+    ("`", TextType.CODE),
+)
+
 def text_to_textnodes(text: str) -> list[TextNode]:
+    """
+    Convert inline markdown to text nodes in a single scan
+
+    Produces the same nodes as applying split_nodes_image,
+    split_nodes_link and split_nodes_delimiter for "**", "_" and "`"
+    in turn, without building the intermediate node lists.
+    """
     nodes: list[TextNode] = []
-    nodes.append(TextNode(text, TextType.TEXT))
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            split_text_delimiters(text[position : match.start()], 0, nodes)
+        if match.group(1) is not None:
+            nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        else:
+            nodes.append(TextNode(match.group(3), TextType.LINK, match.group(4)))
+        position = match.end()
+    if position < len(text):
+        split_text_delimiters(text[position:], 0, nodes)
     return nodes
 
+def split_text_delimiters(text: str, level: int, nodes: list[TextNode]):
+    """
+    Split plain text on INLINE_DELIMITERS[level:], appending to nodes
+    """
+    while level < len(INLINE_DELIMITERS) and INLINE_DELIMITERS[level][0] not in text:
+        level += 1
+    if level == len(INLINE_DELIMITERS):
+        if text:
+            nodes.append(TextNode(text, TextType.TEXT))
+        return
+    delimiter, text_type = INLINE_DELIMITERS[level]
+    sections = text.split(delimiter)
+    if len(sections) % 2 == 0:
+        raise ValueError("invalid markdown, formatted section not closed")
+    for i, section in enumerate(sections):
+        if section == "":
+            continue
+        if i % 2 == 0:
+            split_text_delimiters(section, level + 1, nodes)
+        else:
+            nodes.append(TextNode(section, text_type))
+
 def split_nodes_image(old_nodes: list[TextNode]) -> list[TextNode]:
     new_nodes: list[TextNode] = []
     for old_node in old_nodes:
@@ -352,12 +778,8 @@ def split_nodes_delimiter(
 
 
 def extract_markdown_images(text: str) -> list[tuple[str, str]]:
-    regex_pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(regex_pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text: str) -> list[tuple[str, str]]:
-    regex_pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(regex_pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)